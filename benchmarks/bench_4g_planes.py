@@ -0,0 +1,55 @@
+"""
+Benchmark the 4-gray bit-plane split used by EinkDSP.pic_display_4g.
+
+Compares the original per-bit Python loop with the lookup-table splitter
+(split_4g_planes) on a random 240x416 2-bit frame.
+
+    python benchmarks/bench_4g_planes.py
+"""
+import numpy as np
+
+from bench_common import bench, print_comparison
+from distiller.drivers.eink_dsp import split_4g_planes
+
+FRAME_BYTES = 24960
+ROUNDS = 5
+
+
+def split_4g_planes_loop(datas: list[int]) -> tuple[list[int], list[int]]:
+    """Reference implementation: the loop pic_display_4g used to run, twice."""
+    planes = []
+    for mapping in ({0xC0: 1, 0x00: 0, 0x80: 1, 0x40: 0}, {0xC0: 1, 0x00: 0, 0x80: 0, 0x40: 1}):
+        buffer = []
+        for i in range(FRAME_BYTES // 2):
+            temp3 = 0
+            for j in range(2):
+                temp1 = datas[i * 2 + j]
+                for k in range(4):
+                    temp3 |= mapping[temp1 & 0xC0]
+                    if j == 0:
+                        temp1 <<= 2
+                        temp3 <<= 1
+                    if j == 1 and k != 3:
+                        temp1 <<= 2
+                        temp3 <<= 1
+            buffer.append(temp3)
+        planes.append(buffer)
+    return planes[0], planes[1]
+
+
+def main() -> None:
+    frame = np.random.default_rng(0).integers(0, 256, FRAME_BYTES, dtype=np.uint8)
+    frame_list = [int(x) for x in frame]
+
+    old_ref, new_ref = split_4g_planes_loop(frame_list)
+    old_lut, new_lut = split_4g_planes(frame.tobytes())
+    assert bytes(old_ref) == old_lut and bytes(new_ref) == new_lut, "planes differ"
+
+    print_comparison([
+        ('python loop', bench(split_4g_planes_loop, frame_list, ROUNDS)),
+        ('lookup table', bench(split_4g_planes, frame.tobytes(), ROUNDS)),
+    ], ROUNDS, decimals=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Timing and report helpers shared by the benchmark scripts.
+
+The scripts run as `python benchmarks/<script>.py`, which puts this directory
+on the import path.
+"""
+import time
+from typing import Any, Callable, List, Tuple
+
+
+def bench(func: Callable[[Any], Any], arg: Any, rounds: int) -> float:
+    """
+    Time a call.
+
+    :param func: The function to time.
+    :param arg: The argument it is called with.
+    :param rounds: How many calls to time.
+    :return: The best time of one call, in seconds.
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_comparison(results: List[Tuple[str, float]], rounds: int, decimals: int = 3) -> None:
+    """
+    Print the time of each implementation and its speedup over the first one.
+
+    :param results: (name, seconds) per implementation, the reference first.
+    :param rounds: The rounds the times are the best of.
+    :param decimals: Decimals of the milliseconds printed.
+    """
+    print(f"{'implementation':<20}{'best of ' + str(rounds):>14}")
+    reference = results[0][1]
+    for i, (name, seconds) in enumerate(results):
+        line = f"{name:<20}{seconds * 1000:>11.{decimals}f} ms"
+        if i:
+            line += f"  ({reference / seconds:.0f}x)"
+        print(line)
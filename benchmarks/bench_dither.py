@@ -0,0 +1,60 @@
+"""
+Compare the speed of the dithering engines in distiller.utils.dither.
+
+Dithers a 240x416 gradient for 1-bit (2 levels) and 2-bit (4 levels) frames
+with every engine and prints the best time per frame, packing excluded.
+The display pipeline runs Floyd-Steinberg fused with the packing, the
+'floyd_steinberg fused' row times that (FloydSteinbergPacker), packing
+included. Numba compilation is done before timing.
+
+    python benchmarks/bench_dither.py
+"""
+import time
+import numpy as np
+from PIL import Image
+
+from distiller.constants import EINK_WIDTH, EINK_HEIGHT
+from distiller.utils.dither import FloydSteinbergPacker, dither, list_dither_engines, warm_up
+
+ROUNDS = 10
+
+
+def bench(engine: str, levels: int, frame: np.ndarray) -> float:
+    best = float('inf')
+    for _ in range(ROUNDS):
+        pixels = frame.copy()
+        start = time.perf_counter()
+        dither(pixels, engine, levels)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_fused(bits: int, luma: np.ndarray) -> float:
+    packer = FloydSteinbergPacker(EINK_WIDTH, EINK_HEIGHT, bits)
+    packer.convert(luma)
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        packer.convert(luma)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    warm_up(block=True)
+    frame = np.array(Image.radial_gradient('L').resize((EINK_WIDTH, EINK_HEIGHT)), dtype=np.float32)
+    for engine in list_dither_engines():
+        for levels in (2, 4):
+            dither(frame.copy(), engine, levels)
+
+    print(f"{'engine':<24}{'1-bit ms':>10}{'2-bit ms':>10}")
+    for engine in list_dither_engines():
+        times = [bench(engine, levels, frame) for levels in (2, 4)]
+        print(f"{engine:<24}" + ''.join(f"{t * 1000:>10.3f}" for t in times))
+    luma = frame.astype(np.uint8)
+    times = [bench_fused(bits, luma) for bits in (1, 2)]
+    print(f"{'floyd_steinberg fused':<24}" + ''.join(f"{t * 1000:>10.3f}" for t in times))
+
+
+if __name__ == '__main__':
+    main()
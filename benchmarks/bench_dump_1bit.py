@@ -0,0 +1,51 @@
+"""
+Benchmark the 1-bit packer used by Eink.update_screen_1bit.
+
+Compares the original per-pixel numba loop with the threshold-and-packbits
+dump_1bit on a dithered 240x416 frame, after checking both give the same bytes.
+
+    python benchmarks/bench_dump_1bit.py
+"""
+import numpy as np
+from numba import jit
+
+from bench_common import bench, print_comparison
+from distiller.constants import EINK_WIDTH, EINK_HEIGHT
+from distiller.peripheral.eink import dump_1bit, floydSteinbergDithering_numba
+from distiller.utils.dither import warm_up
+
+ROUNDS = 20
+
+
+@jit(nopython=True, cache=True)
+def dump_1bit_loop(pixels: np.ndarray) -> np.ndarray:
+    """Reference implementation: the loop dump_1bit used to run."""
+    pixels = np.clip(pixels, 0, 255)
+    pixels_quantized = np.digitize(pixels, bins=[64, 128, 192], right=True)
+    result_size = (pixels.size + 7) // 8
+    int_pixels = np.zeros(result_size, dtype=np.uint8)
+    index = 0
+    for i in range(pixels_quantized.size):
+        bit = 1 if pixels_quantized.flat[i] in [2, 3] else 0
+        if i % 8 == 0 and i > 0:
+            index += 1
+        int_pixels[index] |= bit << (7 - (i % 8))
+    return int_pixels
+
+
+def main() -> None:
+    warm_up(block=True)
+    gray = np.random.default_rng(0).uniform(0, 255, (EINK_HEIGHT, EINK_WIDTH)).astype(np.float32)
+    frame = floydSteinbergDithering_numba(gray)
+
+    reference = dump_1bit_loop(frame).tobytes()  # also compiles the loop before timing
+    assert dump_1bit(frame) == reference, "packed frames differ"
+
+    print_comparison([
+        ('numba loop', bench(lambda pixels: dump_1bit_loop(pixels).tobytes(), frame, ROUNDS)),
+        ('packbits', bench(dump_1bit, frame, ROUNDS)),
+    ], ROUNDS)
+
+
+if __name__ == '__main__':
+    main()
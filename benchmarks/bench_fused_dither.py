@@ -0,0 +1,64 @@
+"""
+Benchmark the fused Floyd-Steinberg packer against the separate steps.
+
+For 1-bit and 2-bit 240x416 frames, compares dithering a float32 copy and
+packing it (dump_1bit / pack_2bit) with FloydSteinbergPacker, which reads the
+8-bit luminance once and writes the packed frame into a reused buffer. Prints
+the best time per frame and the memory allocated per frame (tracemalloc, the
+luminance array excluded).
+
+    python benchmarks/bench_fused_dither.py
+"""
+import time
+import tracemalloc
+import numpy as np
+from PIL import Image
+
+from distiller.constants import EINK_WIDTH, EINK_HEIGHT
+from distiller.peripheral.eink import dump_1bit, pack_2bit
+from distiller.utils.dither import FloydSteinbergPacker, floydSteinbergDithering_numba, warm_up
+
+ROUNDS = 20
+
+
+def separate_1bit(luma: np.ndarray) -> bytes:
+    return dump_1bit(floydSteinbergDithering_numba(luma.astype(np.float32)))
+
+
+def separate_2bit(luma: np.ndarray) -> bytes:
+    return pack_2bit(floydSteinbergDithering_numba(luma.astype(np.float32)))
+
+
+def bench(func, luma: np.ndarray) -> tuple[float, int]:
+    func(luma)  # compile and allocate the reused buffers
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(luma)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(luma)
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, allocated
+
+
+def main() -> None:
+    warm_up(block=True)
+    luma = np.asarray(Image.radial_gradient('L').resize((EINK_WIDTH, EINK_HEIGHT)))
+    packer_1bit = FloydSteinbergPacker(EINK_WIDTH, EINK_HEIGHT, bits=1)
+    packer_2bit = FloydSteinbergPacker(EINK_WIDTH, EINK_HEIGHT, bits=2)
+    cases = [
+        ('1-bit separate', separate_1bit),
+        ('1-bit fused', packer_1bit.convert),
+        ('2-bit separate', separate_2bit),
+        ('2-bit fused', packer_2bit.convert),
+    ]
+    print(f"{'pipeline':<18}{'ms':>8}{'allocated':>12}")
+    for name, func in cases:
+        seconds, allocated = bench(func, luma)
+        print(f"{name:<18}{seconds * 1000:>8.3f}{allocated:>10} B")
+
+
+if __name__ == '__main__':
+    main()
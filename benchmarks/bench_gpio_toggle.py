@@ -0,0 +1,76 @@
+"""
+Benchmark the cost of one GPIO toggle on the backends EinkDSP drives DC with.
+
+On a Rock board it compares RockGPIO.output, which looks the pin up by name,
+with the RockPin handle returned by RockGPIO.setup. On a Raspberry Pi it
+measures RPi.GPIO.output. The simulated GPIO is always measured as a floor
+for the Python call overhead. Backends that are not available are skipped.
+
+Toggles the e-ink DC pin, run it while nothing else drives the panel.
+
+    python benchmarks/bench_gpio_toggle.py [--toggles 20000]
+"""
+import argparse
+import time
+from typing import Callable, List, Tuple
+
+from distiller.drivers.eink_sim import SimulatedPanel
+
+ROUNDS = 5
+RK_DC_PIN = "GPIO1_C6"
+RPI_DC_PIN = 6
+
+
+def bench(toggle: Callable[[bool], None], toggles: int) -> float:
+    """ Best time per toggle over ROUNDS, in seconds """
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for i in range(toggles):
+            toggle(i & 1)
+        best = min(best, (time.perf_counter() - start) / toggles)
+    return best
+
+
+def rock_backends() -> List[Tuple[str, Callable[[bool], None]]]:
+    from gpiod.line import Direction, Value
+    from distiller.drivers.rock_gpio import RockGPIO
+
+    gpio = RockGPIO()
+    handle = gpio.setup(RK_DC_PIN, Direction.OUTPUT)
+    levels = (Value.INACTIVE, Value.ACTIVE)
+    return [
+        ('rock by name', lambda level: gpio.output(RK_DC_PIN, levels[level])),
+        ('rock handle', lambda level: handle.set(levels[level])),
+    ]
+
+
+def rpi_backends() -> List[Tuple[str, Callable[[bool], None]]]:
+    import RPi.GPIO as GPIO
+
+    GPIO.setwarnings(False)
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(RPI_DC_PIN, GPIO.OUT)
+    return [('rpi output', lambda level: GPIO.output(RPI_DC_PIN, level))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--toggles', type=int, default=20000, help='toggles per round')
+    args = parser.parse_args()
+
+    gpio = SimulatedPanel(time_scale=0).gpio
+    backends = [('simulated', lambda level: gpio.output(gpio.dc_pin, level))]
+    for name, factory in (('rock', rock_backends), ('rpi', rpi_backends)):
+        try:
+            backends += factory()
+        except (ImportError, RuntimeError, OSError) as e:
+            print(f"skipping {name}: {e}")
+
+    print(f"{'backend':<16}{'per toggle':>12}")
+    for name, toggle in backends:
+        print(f"{name:<16}{bench(toggle, args.toggles) * 1e6:>9.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark the 2-bit packer used by Eink.preprocess_2bit.
+
+Compares the original string-based packer with the shift-and-or pack_2bit on
+a dithered 240x416 frame, after checking both give the same bytes.
+
+    python benchmarks/bench_pack_2bit.py
+"""
+import numpy as np
+
+from bench_common import bench, print_comparison
+from distiller.constants import EINK_WIDTH, EINK_HEIGHT
+from distiller.peripheral.eink import floydSteinbergDithering_numba, pack_2bit
+from distiller.utils.dither import warm_up
+
+ROUNDS = 5
+
+
+def pack_2bit_strings(pixels: np.ndarray) -> bytes:
+    """Reference implementation: the packer preprocess_2bit used to run."""
+    pixels = np.clip(pixels, 0, 255)
+    pixels_quantized = np.digitize(pixels, bins=[64, 128, 192], right=True)
+
+    pixel_map = {0: '00', 1: '01', 2: '10', 3: '11'}
+    pixels_string = np.vectorize(pixel_map.get)(pixels_quantized).flatten()
+
+    group_size = 4
+    grouped_pixels = [''.join(pixels_string[i:i+group_size])
+                      for i in range(0, len(pixels_string), group_size)]
+    return bytes(int(bits, 2) for bits in grouped_pixels)
+
+
+def main() -> None:
+    warm_up(block=True)
+    gray = np.random.default_rng(0).uniform(0, 255, (EINK_HEIGHT, EINK_WIDTH)).astype(np.float32)
+    frame = floydSteinbergDithering_numba(gray)
+
+    assert pack_2bit(frame) == pack_2bit_strings(frame), "packed frames differ"
+
+    print_comparison([
+        ('strings', bench(pack_2bit_strings, frame, ROUNDS)),
+        ('shift and or', bench(pack_2bit, frame, ROUNDS)),
+    ], ROUNDS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Profile the display pipeline headless, from Eink down to the bytes on the wire.
+
+Runs a few 1-bit and 2-bit updates against a SimulatedPanel and prints the
+host time per update split into the phases Eink.last_timing reports, the
+traffic the panel received and the modeled BUSY time. Pass --profile for a cProfile breakdown, --dump to save the simulated
+framebuffer.
+
+    python benchmarks/profile_eink_sim.py [--profile] [--dump panel.png]
+"""
+import argparse
+import cProfile
+import pstats
+import time
+
+from PIL import Image, ImageDraw
+
+from distiller.constants import EINK_WIDTH, EINK_HEIGHT
+from distiller.drivers.eink_sim import SimulatedPanel
+from distiller.peripheral.eink import Eink
+from distiller.utils.dither import warm_up
+
+
+def menu_frame(selected: int) -> Image.Image:
+    image = Image.new('L', (EINK_WIDTH, EINK_HEIGHT), 'white')
+    draw = ImageDraw.Draw(image)
+    for row in range(8):
+        box = (10, 20 + row * 40, EINK_WIDTH - 10, 50 + row * 40)
+        draw.rounded_rectangle(box, radius=4, fill='black' if row == selected else 'white', outline='black')
+    return image
+
+
+def photo_frame() -> Image.Image:
+    return Image.radial_gradient('L').resize((EINK_WIDTH, EINK_HEIGHT))
+
+
+def run(eink: Eink, panel: SimulatedPanel) -> None:
+    updates = [('2bit', photo_frame())] + [('1bit', menu_frame(i % 8)) for i in range(8)]
+    print(f"{'update':<8}{'host ms':>10}{'prep':>8}{'reset':>8}{'init':>8}{'tx':>8}"
+          f"{'spi calls':>11}{'bytes':>9}{'busy s':>9}")
+    for format, image in updates:
+        panel.clear_log()
+        start = time.perf_counter()
+        if format == '1bit':
+            eink.update_screen_1bit(image)
+        else:
+            eink.update_screen_2bit(image)
+        elapsed = time.perf_counter() - start
+        timing = eink.last_timing
+        print(f"{format:<8}{elapsed * 1000:>10.1f}{timing.preprocess * 1000:>8.1f}{timing.reset * 1000:>8.1f}"
+              f"{timing.init * 1000:>8.1f}{(timing.old_plane + timing.new_plane) * 1000:>8.1f}"
+              f"{panel.spi_calls:>11}{panel.bytes_sent:>9}{panel.modeled_busy_time():>9.2f}")
+    if panel.errors:
+        print("protocol errors:", panel.errors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profile', action='store_true', help='print a cProfile breakdown')
+    parser.add_argument('--dump', help='save the simulated framebuffer to this path')
+    args = parser.parse_args()
+
+    panel = SimulatedPanel(time_scale=0)
+    eink = Eink(backend=panel)
+    warm_up(block=True)  # measure the numba kernels, not their Python fallback
+    eink.update_screen_1bit(menu_frame(0))
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(run, eink, panel)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+    else:
+        run(eink, panel)
+
+    if args.dump:
+        panel.save(args.dump)
+
+
+if __name__ == '__main__':
+    main()
@@ -62,7 +62,7 @@ class SelectionPage(Page):
         self.ui.paste_image(self.dialog.get_image(),
                             self.dialog.kwargs.get('position'))
 
-        self.render_page(self.ui.get_image(), format='2bit')
+        self.render_page(self.ui.get_image(), format='auto')
 
     def get_image(self, index=0):
         return paste_image(
@@ -79,7 +79,7 @@ class SelectionPage(Page):
             # main ui render
             self.ui.paste_image(self.dialog.get_image(), self.dialog.kwargs.get(
                 'position'))  # update on main ui
-            self.render_page(self.ui.get_image(), format='2bit')  # render
+            self.render_page(self.ui.get_image(), format='auto')  # render
             return
         
         if input == 2:
@@ -88,7 +88,7 @@ class SelectionPage(Page):
             return
 
     def display(self, image):
-        self.render_page(paste_image(image, self.ui.get_image(), border=True), format='2bit')
+        self.render_page(paste_image(image, self.ui.get_image(), border=True), format='auto')
 
 
 class App(Application):
@@ -1,61 +1,248 @@
 
 import time
-import spidev
+import logging
 import platform
 import uuid
-from typing import List
+import functools
+import queue
+import numpy as np
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
 
 _ROCK = 'rockchip' in platform.release()
 
+# The hardware modules only exist on the device, a simulated backend
+# (distiller.drivers.eink_sim) can be used without them
+try:
+    import spidev
+except ImportError:
+    spidev = None
+
 if not _ROCK:
-    import RPi.GPIO as GPIO
+    try:
+        import RPi.GPIO as GPIO
+    except (ImportError, RuntimeError):
+        GPIO = None
 else:
-    from gpiod.line import Direction, Value, Bias
+    from gpiod.line import Direction, Value, Bias, Edge
     from .rock_gpio import RockGPIO
 
+from .waveforms import Waveform, get_waveform
+
+# Upper bound for one RPi.GPIO edge wait, so a BUSY edge that fires between the
+# level check and arming the edge detection costs at most this much latency
+_BUSY_EDGE_SLICE_S = 0.1
+
+# OTP waveform fast refresh: temperature override for the fast LUT
+INIT_FAST_PROGRAM: List[Tuple[int, bytes]] = [
+    (0xE0, bytes([0x02])),
+    (0xE5, bytes([0x5A])),
+]
+
+# OTP waveform partial refresh: temperature override plus floating border
+INIT_PART_PROGRAM: List[Tuple[int, bytes]] = [
+    (0xE0, bytes([0x02])),
+    (0xE5, bytes([0x6E])),
+    (0x50, bytes([0xD7])),
+]
+
+# Plane transfers timed as their own UpdateTiming phase
+_PLANE_PHASES: Dict[int, str] = {0x10: 'old_plane', 0x13: 'new_plane'}
+
+# Marks the end of the items handed over by EinkDSP._prefetch
+_STREAM_END = object()
+
+T = TypeVar('T')
+
+
+# A frame buffer: any bytes-like object or uint8 array (lists of ints are still accepted)
+FrameBuffer = Union[bytes, bytearray, memoryview, np.ndarray, List[int]]
+
+
+def _as_uint8(data: FrameBuffer) -> np.ndarray:
+    """ View a frame buffer (bytes-like, list or array) as a flat uint8 array """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return np.frombuffer(data, dtype=np.uint8)
+    return np.asarray(data, dtype=np.uint8).reshape(-1)
+
+
+def _to_bytes(data: FrameBuffer) -> bytes:
+    """ Snapshot a frame buffer as immutable bytes, copying only when needed """
+    if isinstance(data, bytes):
+        return data
+    return _as_uint8(data).tobytes()
+
+
+def _build_4g_nibble_luts() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build lookup tables mapping a packed 2-bit byte (4 pixels) to the 4-bit
+    nibble it contributes to the old and new bit planes.
+
+    White (11) and Gray1 (10) set the old bit, White (11) and Gray2 (01) set
+    the new bit, i.e. the old plane is the high bit and the new plane the low
+    bit of every pixel.
+    """
+    values = np.arange(256, dtype=np.uint16)
+    old_lut = np.zeros(256, dtype=np.uint8)
+    new_lut = np.zeros(256, dtype=np.uint8)
+    for k in range(4):
+        pixel = (values >> (6 - 2 * k)) & 0x03
+        old_lut |= (((pixel >> 1) & 0x01) << (3 - k)).astype(np.uint8)
+        new_lut |= ((pixel & 0x01) << (3 - k)).astype(np.uint8)
+    return old_lut, new_lut
+
+
+_OLD_NIBBLE_LUT, _NEW_NIBBLE_LUT = _build_4g_nibble_luts()
+
+
+def split_4g_planes(datas: FrameBuffer) -> Tuple[bytes, bytes]:
+    """
+    Split a packed 2-bit image into the old and new bit planes of the 4-gray mode.
+
+    :param datas: The packed 2-bit image, 4 pixels per byte (24960 bytes).
+    :return: The old and new planes as bytes, 8 pixels per byte (12480 bytes each).
+    """
+    packed = _as_uint8(datas).reshape(-1, 2)
+    old_plane = (_OLD_NIBBLE_LUT[packed[:, 0]] << 4) | _OLD_NIBBLE_LUT[packed[:, 1]]
+    new_plane = (_NEW_NIBBLE_LUT[packed[:, 0]] << 4) | _NEW_NIBBLE_LUT[packed[:, 1]]
+    return old_plane.tobytes(), new_plane.tobytes()
+
+
+def changed_window(old_data: FrameBuffer, new_data: FrameBuffer, width: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Compute the bounding box of the bytes that differ between two packed 1-bit frames.
+
+    :param old_data: The frame currently on the panel.
+    :param new_data: The frame to display.
+    :param width: The panel width in pixels.
+    :return: (x_start, x_end, y_start, y_end) with x in bytes (8-pixel columns)
+             and y in rows, end exclusive, or None if the frames are identical.
+    """
+    width_bytes = (width + 7) // 8
+    diff = (_as_uint8(old_data) != _as_uint8(new_data)).reshape(-1, width_bytes)
+    rows = np.flatnonzero(diff.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(diff.any(axis=0))
+    return int(cols[0]), int(cols[-1]) + 1, int(rows[0]), int(rows[-1]) + 1
+
+
+def window_area(window: Tuple[int, int, int, int]) -> int:
+    """ Number of frame bytes covered by a window from changed_window """
+    x_start, x_end, y_start, y_end = window
+    return (x_end - x_start) * (y_end - y_start)
+
+
+_BLANK_PLANE = bytes(12480)
+
+
+@dataclass
+class UpdateTiming:
+    """
+    Where the time of one screen update went, in seconds, and its SPI traffic.
+
+    Phases are exclusive: the busy wait of the power on inside an init counts
+    as init, not busy. busy only covers waiting for refreshes, for a
+    non-blocking refresh it is filled in once the background wait ends.
+    """
+    preprocess: float = 0.0  # Image conversion and packing, waits for streamed bands included
+    reset: float = 0.0  # Hardware reset pulse and its sleeps
+    init: float = 0.0  # Init programs, LUT uploads and power on
+    old_plane: float = 0.0  # Old plane (0x10) transfer
+    new_plane: float = 0.0  # New plane (0x13) transfer
+    busy: float = 0.0  # Waiting for the refresh waveform to finish
+    bytes_sent: int = 0  # Command and data bytes written over SPI
+    spi_writes: int = 0  # SPI transfers
+
+    @property
+    def total(self) -> float:
+        return self.preprocess + self.reset + self.init + self.old_plane + self.new_plane + self.busy
+
+
+@dataclass
+class TraceEvent:
+    """One event passed to EinkDSP.trace."""
+    timestamp: float  # time.monotonic() when the event ended
+    kind: str  # 'command', 'phase' or 'busy'
+    name: str  # The command as '0x12' or the UpdateTiming phase
+    duration: float = 0.0  # Seconds
+    size: int = 0  # Payload bytes of a command
+
+
+def _timed_phase(phase: str):
+    """ Decorator counting the time spent in a method towards an UpdateTiming phase """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._phase(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
 
 class EinkDSP:
-    def __init__(self) -> None:
-
-        self.LUT_ALL: List[int] = [
-            0x01,	0x05,	0x20,	0x19,	0x0A,	0x01,	0x01,
-            0x05,	0x0A,	0x01,	0x0A,	0x01,	0x01,	0x01,
-            0x05,	0x09,	0x02,	0x03,	0x04,	0x01,	0x01,
-            0x01,	0x04,	0x04,	0x02,	0x00,	0x01,	0x01,
-            0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
-            0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
-            0x01,	0x05,	0x20,	0x19,	0x0A,	0x01,	0x01,
-            0x05,	0x4A,	0x01,	0x8A,	0x01,	0x01,	0x01,
-            0x05,	0x49,	0x02,	0x83,	0x84,	0x01,	0x01,
-            0x01,	0x84,	0x84,	0x82,	0x00,	0x01,	0x01,
-            0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
-            0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
-            0x01,	0x05,	0x20,	0x99,	0x8A,	0x01,	0x01,
-            0x05,	0x4A,	0x01,	0x8A,	0x01,	0x01,	0x01,
-            0x05,	0x49,	0x82,	0x03,	0x04,	0x01,	0x01,
-            0x01,	0x04,	0x04,	0x02,	0x00,	0x01,	0x01,
-            0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
-            0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
-            0x01,	0x85,	0x20,	0x99,	0x0A,	0x01,	0x01,
-            0x05,	0x4A,	0x01,	0x8A,	0x01,	0x01,	0x01,
-            0x05,	0x49,	0x02,	0x83,	0x04,	0x01,	0x01,
-            0x01,	0x04,	0x04,	0x02,	0x00,	0x01,	0x01,
-            0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
-            0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
-            0x01,	0x85,	0xA0,	0x99,	0x0A,	0x01,	0x01,
-            0x05,	0x4A,	0x01,	0x8A,	0x01,	0x01,	0x01,
-            0x05,	0x49,	0x02,	0x43,	0x04,	0x01,	0x01,
-            0x01,	0x04,	0x04,	0x42,	0x00,	0x01,	0x01,
-            0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
-            0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
-            0x09,	0x10,	0x3F,	0x3F,	0x00,	0x0B,
-        ]
-        self.emptyImage: List[int] = [0xFF] * 24960
-        self.oldData: List[int] = [0] * 12480
+    def __init__(self, backend=None, reuse_ram: bool = False) -> None:
+        """
+        Initialize the panel driver.
+
+        :param backend: Optional hardware backend providing `spi` (a spidev.SpiDev
+                        compatible bus) and `gpio` (an RPi.GPIO compatible module),
+                        e.g. distiller.drivers.eink_sim.SimulatedPanel. The real
+                        SPI bus and GPIO are used when None.
+        :param reuse_ram: With a 1-bit register waveform loaded, keep the plane RAM
+                          holding the frame on the panel and send the next frame
+                          to the other plane, exchanging the R and W LUTs when that
+                          is the old plane, so consecutive updates only send one
+                          plane. The OTP modes always send both planes.
+        """
+        self._backend = backend
+        self._rock = _ROCK and backend is None
+        if backend is None and (spidev is None or (not _ROCK and GPIO is None)):
+            raise ImportError("spidev and RPi.GPIO/gpiod are required to drive the panel, "
+                              "pass a simulated backend to run without them")
+
+        self.emptyImage: bytes = bytes([0xFF]) * 24960
+        self.oldData: bytes = _BLANK_PLANE
+        # Region updates larger than this fraction of the frame refresh the full panel
+        self.region_max_fraction: float = 0.5
+        # Longest BUSY period tolerated before lcd_chkstatus gives up, in seconds
+        self.busy_timeout: float = 15.0
+        self.last_busy_duration: float = 0.0
+        self.busy_durations: deque = deque(maxlen=64)
+        # Background BUSY wait of the last non-blocking refresh
+        self._busy_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='eink-busy')
+        self._pending: Optional[Future] = None
+        # Converts the bands of streamed frames while the previous ones are sent
+        self._stream_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='eink-stream')
+        self._partial_window = False
+
+        # Timing of the update in progress, see take_timing
+        self._timing = UpdateTiming()
+        self._phase_children: List[float] = []
+        # Optional callback receiving a TraceEvent per command, phase and busy wait
+        self.trace: Optional[Callable[[TraceEvent], None]] = None
+
+        # Controller state, so updates only reset/re-init when the mode changes
+        self.mode: Optional[str] = None  # 'init', 'fast', 'part' or 'lut', None when unknown
+        self.lut: Optional[str] = None  # Waveform in the LUT registers, None for OTP
+        # 1-bit register waveforms scan top row first, frames arrive bottom row first
+        self._flip_rows = False
+        self.powered = False
+        self.asleep = False
+        # Controller plane RAM tracking, see reuse_ram
+        self.reuse_ram = reuse_ram
+        self._ram: Dict[int, Optional[bytes]] = {0x10: None, 0x13: None}  # Plane RAM as sent, None if unknown
+        self._luts_swapped = False  # The R and W LUTs of the 1-bit waveform are exchanged
+        self.plane_uploads_saved = 0
+        # Mode and waveform to restore when waking from deep sleep
+        self._wake_mode: Tuple[Optional[str], Optional[str]] = ('part', None)
 
         # Pin Def
 
-        if _ROCK:
+        if self._rock:
             self.RK_DC_PIN = "GPIO1_C6"
             self.RK_RST_PIN = "GPIO1_B1"
             self.RK_BUSY_PIN = "GPIO0_D3"
@@ -67,34 +254,64 @@ class EinkDSP:
         self.EPD_WIDTH = 240
         self.EPD_HEIGHT = 416
 
-        if _ROCK:
+        if self._rock:
             self.RockGPIO = RockGPIO()
         else:
-            self.GPIO = GPIO
+            self.GPIO = backend.gpio if backend else GPIO
+
+        self._programs: Dict[Waveform, List[Tuple[int, bytes]]] = {}
 
         self.spi = self.EPD_GPIO_Init()
         self.epd_w21_init_4g()
 
     def cleanup(self) -> None:
-        if _ROCK:
-            self.RockGPIO.cleanup()
-
-    def EPD_GPIO_Init(self) -> spidev.SpiDev:
-        if not _ROCK:
+        try:
+            self.wait_idle()
+        finally:
+            self._busy_executor.shutdown()
+            self._stream_executor.shutdown()
+            self.spi.close()
+            if self._rock:
+                self.RockGPIO.cleanup()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until the refresh started by a non-blocking call has finished.
+
+        Every register write and reset calls this first, so a new update always
+        waits for the previous refresh before touching the controller.
+
+        :param timeout: The maximum time to wait in seconds, None to wait for
+                        lcd_chkstatus to finish or time out by itself.
+        :raises TimeoutError: If the panel never released BUSY. The failed
+                              refresh is raised once and then forgotten.
+        """
+        pending = self._pending
+        if pending is not None:
+            try:
+                pending.result(timeout)
+            finally:
+                # Keep a refresh that is still running, drop a finished or failed one
+                if pending.done():
+                    self._pending = None
+
+    def EPD_GPIO_Init(self) -> "spidev.SpiDev":
+        if not self._rock:
             self.GPIO.setwarnings(False)
-            self.GPIO.setmode(GPIO.BCM)
-            self.GPIO.setup(self.DC_PIN, GPIO.OUT)
-            self.GPIO.setup(self.RST_PIN, GPIO.OUT)
-            self.GPIO.setup(self.BUSY_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            self.GPIO.setmode(self.GPIO.BCM)
+            self.GPIO.setup(self.DC_PIN, self.GPIO.OUT)
+            self.GPIO.setup(self.RST_PIN, self.GPIO.OUT)
+            self.GPIO.setup(self.BUSY_PIN, self.GPIO.IN, pull_up_down=self.GPIO.PUD_UP)
         else:
-            self.RockGPIO.setup(self.RK_DC_PIN, Direction.OUTPUT)
-            self.RockGPIO.setup(self.RK_RST_PIN, Direction.OUTPUT)
-            self.RockGPIO.setup(
-                self.RK_BUSY_PIN, Direction.INPUT, bias=Bias.PULL_UP)
+            # Keep the resolved handles, DC toggles twice per register write
+            self._dc_pin = self.RockGPIO.setup(self.RK_DC_PIN, Direction.OUTPUT)
+            self._rst_pin = self.RockGPIO.setup(self.RK_RST_PIN, Direction.OUTPUT)
+            self._busy_pin = self.RockGPIO.setup(
+                self.RK_BUSY_PIN, Direction.INPUT, bias=Bias.PULL_UP, edge=Edge.RISING)
 
         bus = 0
         device = 0
-        spi = spidev.SpiDev()
+        spi = self._backend.spi if self._backend else spidev.SpiDev()
         spi.open(bus, device)
         spi.max_speed_hz = 30000000
         spi.mode = 0
@@ -108,30 +325,186 @@ class EinkDSP:
         return self.spi.xfer2([value])
 
     def epd_w21_write_cmd(self, command: int) -> None:
+        self.wait_idle()
         self.SPI_Delay()
-        if _ROCK:
-            self.RockGPIO.output(self.RK_DC_PIN, Value.INACTIVE)  # Data mode
-        else:
-            self.GPIO.output(self.DC_PIN, GPIO.LOW)
+        self._set_dc(False)
         self.SPI_Write(command)
 
     def epd_w21_write_data(self, data: int) -> None:
+        self.wait_idle()
         self.SPI_Delay()
-        if _ROCK:
-            self.RockGPIO.output(self.RK_DC_PIN, Value.ACTIVE)  # Data mode
-        else:
-            self.GPIO.output(self.DC_PIN, GPIO.HIGH)
+        self._set_dc(True)
         self.SPI_Write(data)
 
+    def _set_dc(self, data_mode: bool) -> None:
+        """ Drive the DC pin, HIGH selects data and LOW selects command """
+        if self._rock:
+            self._dc_pin.set(Value.ACTIVE if data_mode else Value.INACTIVE)
+        else:
+            self.GPIO.output(self.DC_PIN, self.GPIO.HIGH if data_mode else self.GPIO.LOW)
+
+    def write_register(self, command: int, payload: bytes = b'') -> None:
+        """
+        Write a command byte followed by its parameters.
+
+        DC is toggled once for the command and once for the payload, which is
+        sent in a single SPI transfer instead of one transfer per byte.
+
+        :param command: The controller command/register address.
+        :param payload: The parameter bytes for the command.
+        """
+        self.wait_idle()
+        phase = _PLANE_PHASES.get(command)
+        if phase is not None:
+            with self._phase(phase):
+                self._write_register(command, payload)
+        else:
+            self._write_register(command, payload)
+
+    def _write_register(self, command: int, payload: bytes) -> None:
+        start = time.perf_counter()
+        self.SPI_Delay()
+        self._set_dc(False)
+        self.spi.writebytes([command])
+        if payload:
+            self._set_dc(True)
+            self.spi.writebytes2(payload)
+        self._timing.bytes_sent += 1 + len(payload)
+        self._timing.spi_writes += 2 if payload else 1
+        if self.trace is not None:
+            self.trace(TraceEvent(time.monotonic(), 'command', f'0x{command:02X}',
+                                  time.perf_counter() - start, len(payload)))
+
+    def write_register_stream(self, command: int, chunks: Iterable[bytes]) -> bytes:
+        """
+        Write a command byte followed by parameters that arrive in chunks.
+
+        Every chunk goes out in its own SPI transfer as soon as the iterator
+        yields it, the controller takes them as one payload.
+
+        :param command: The controller command/register address.
+        :param chunks: The parameter bytes, in order.
+        :return: The whole payload that was sent.
+        """
+        self.wait_idle()
+        phase = _PLANE_PHASES.get(command)
+        if phase is None:
+            return self._write_register_stream(command, chunks)
+        with self._phase(phase):
+            return self._write_register_stream(command, chunks)
+
+    def _write_register_stream(self, command: int, chunks: Iterable[bytes]) -> bytes:
+        start = time.perf_counter()
+        self.SPI_Delay()
+        self._set_dc(False)
+        self.spi.writebytes([command])
+        sent: List[bytes] = []
+        for chunk in chunks:
+            if not sent:
+                self._set_dc(True)
+            self.spi.writebytes2(chunk)
+            sent.append(chunk)
+        payload = b''.join(sent)
+        self._timing.bytes_sent += 1 + len(payload)
+        self._timing.spi_writes += 1 + len(sent)
+        if self.trace is not None:
+            self.trace(TraceEvent(time.monotonic(), 'command', f'0x{command:02X}',
+                                  time.perf_counter() - start, len(payload)))
+        return payload
+
+    def _prefetch(self, items: Iterable[T]) -> Iterator[T]:
+        """
+        Start consuming an iterable on the stream thread and hand over its items
+        as they complete. Waiting for an item counts as preprocess time.
+
+        :param items: The iterable, e.g. a generator converting a frame band by band.
+        :return: An iterator over the same items.
+        """
+        handoff: queue.Queue = queue.Queue()
+
+        def produce() -> None:
+            try:
+                for item in items:
+                    handoff.put((item, None))
+            except Exception as e:
+                handoff.put((_STREAM_END, e))
+            else:
+                handoff.put((_STREAM_END, None))
+
+        self._stream_executor.submit(produce)
+        return self._drain(handoff)
+
+    def _drain(self, handoff: queue.Queue) -> Iterator:
+        while True:
+            with self._phase('preprocess'):
+                item, error = handoff.get()
+            if error is not None:
+                raise error
+            if item is _STREAM_END:
+                return
+            yield item
+
+    @contextmanager
+    def _phase(self, name: str):
+        """
+        Count the time spent in the block towards an UpdateTiming phase. Nested
+        phases are subtracted from the enclosing one.
+        """
+        start = time.perf_counter()
+        self._phase_children.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._phase_children.pop()
+            setattr(self._timing, name, getattr(self._timing, name) + elapsed - children)
+            if self._phase_children:
+                self._phase_children[-1] += elapsed
+            if self.trace is not None:
+                self.trace(TraceEvent(time.monotonic(), 'phase', name, elapsed))
+
+    def take_timing(self) -> UpdateTiming:
+        """
+        Hand over the timing collected since the last call and start a new one.
+
+        :return: The phases and traffic of the update that just ended.
+        """
+        timing, self._timing = self._timing, UpdateTiming()
+        return timing
+
+    def run_program(self, program: Sequence[Tuple[int, bytes]]) -> None:
+        """
+        Write a precompiled sequence of (command, payload) register writes.
+
+        :param program: The register writes to send, in order.
+        """
+        for command, payload in program:
+            self.write_register(command, payload)
+
     def delay_xms(self, xms: int) -> None:
         time.sleep(xms / 1000.0)
 
+    @_timed_phase('reset')
     def epd_w21_init(self) -> None:
+        try:
+            self.wait_idle()
+        except TimeoutError as e:
+            # A reset is how a stuck refresh is recovered, so it must not fail on it
+            logging.warning(f"Resetting e-ink panel after a stuck refresh: {e}")
+        self._partial_window = False
+        self._flip_rows = False
+        # The LUTs are gone and the RAM content is not trusted after a reset
+        self._luts_swapped = False
+        self._forget_ram()
+        self.mode = None
+        self.lut = None
+        self.powered = False
+        self.asleep = False
         self.delay_xms(100)
-        if _ROCK:
-            self.RockGPIO.output(self.RK_RST_PIN, Value.INACTIVE)
+        if self._rock:
+            self._rst_pin.set(Value.INACTIVE)
             self.delay_xms(20)
-            self.RockGPIO.output(self.RK_RST_PIN, Value.ACTIVE)
+            self._rst_pin.set(Value.ACTIVE)
             self.delay_xms(20)
         else:
             self.GPIO.output(self.RST_PIN, False)
@@ -139,282 +512,521 @@ class EinkDSP:
             self.GPIO.output(self.RST_PIN, True)
             self.delay_xms(20)
 
-    def EPD_Display(self, image: List[int]) -> None:
+    def EPD_Display(self, image: FrameBuffer) -> None:
         width = (self.EPD_WIDTH + 7) // 8
         height = self.EPD_HEIGHT
 
-        self.epd_w21_write_cmd(0x10)
-        for j in range(height):
-            for i in range(width):
-                self.epd_w21_write_data(image[i + j * width])
-
-        self.epd_w21_write_cmd(0x13)
-        for _ in range(height * width):
-            self.epd_w21_write_data(0x00)
-
-        self.epd_w21_write_cmd(0x12)
-        self.delay_xms(1)  # Necessary delay
-        self.lcd_chkstatus()
-
-    def lcd_chkstatus(self) -> None:
-        if _ROCK:
-            # Assuming LOW means busy
-            while self.RockGPIO.input(self.RK_BUSY_PIN) == Value.INACTIVE:
-                time.sleep(0.01)
+        self._exit_partial_window()
+        self._orient_luts(False)
+        self.write_register(0x10, self._wire_plane(_to_bytes(image)[:height * width]))
+        self.write_register(0x13, _BLANK_PLANE)
+        self._forget_ram()
+
+        self.refresh()
+
+    def lcd_chkstatus(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for the panel to release BUSY (LOW means busy).
+
+        Blocks on the BUSY rising edge instead of polling, and records how long
+        the busy period lasted in last_busy_duration / busy_durations.
+
+        :param timeout: The maximum time to wait in seconds, busy_timeout if None.
+        :raises TimeoutError: If the panel is still busy after the timeout.
+        """
+        timeout = self.busy_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        if self._rock:
+            # Events stay queued once armed, so drain stale ones before the level check
+            self._busy_pin.clear_edge_events()
+            while self._busy_pin.get() == Value.INACTIVE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"e-ink panel still busy after {timeout}s")
+                self._busy_pin.wait_for_edge(remaining)
         else:
-            while self.GPIO.input(self.BUSY_PIN) == GPIO.LOW:  # Assuming LOW means busy
-                time.sleep(0.01)  # Wait 10ms before checking again
+            while self.GPIO.input(self.BUSY_PIN) == self.GPIO.LOW:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"e-ink panel still busy after {timeout}s")
+                self.GPIO.wait_for_edge(self.BUSY_PIN, self.GPIO.RISING,
+                                        timeout=max(1, int(min(remaining, _BUSY_EDGE_SLICE_S) * 1000)))
+        self.last_busy_duration = time.monotonic() - start
+        self.busy_durations.append(self.last_busy_duration)
+
+    def invalidate_state(self) -> None:
+        """
+        Forget the tracked controller state, e.g. after another driver instance
+        used the panel, so the next init performs a full reset.
+        """
+        self.mode = None
+        self.lut = None
+        self._forget_ram()
+
+    def _forget_ram(self) -> None:
+        self._ram = {0x10: None, 0x13: None}
+
+    def _resume_mode(self, mode: str) -> bool:
+        """
+        Check whether the controller is still configured for a mode, powering it
+        back on if it was only powered off.
+
+        :param mode: The mode the caller is about to initialize.
+        :return: True if the mode is active and no reset/init is needed.
+        """
+        if self.mode != mode or self.asleep:
+            return False
+        if not self.powered:
+            self.power_on()
+        return True
 
     def epd_sleep(self) -> None:
-        self.epd_w21_write_cmd(0x02)  # Power off
-        self.lcd_chkstatus()  # Implement this to check the display's busy status
+        if self.powered or self.mode is None:
+            self.write_register(0x02)  # Power off
+            self.lcd_chkstatus()  # Implement this to check the display's busy status
+
+        self.write_register(0x07, bytes([0xA5]))  # Deep sleep
+        # Only a hardware reset wakes the controller, and it loses its registers
+        if self.mode is not None:
+            self._wake_mode = (self.mode, self.lut)
+        self._forget_ram()
+        self.powered = False
+        self.asleep = True
+        self.mode = None
+        self.lut = None
+
+    def wake(self) -> None:
+        """
+        Bring the controller back up in the mode it had before power off or deep
+        sleep: a power on after power_off(), a reset and init of that mode only
+        after epd_sleep(). oldData is kept either way.
+        """
+        if self.powered:
+            return
+        mode, lut = self._wake_mode if self.asleep else (self.mode, self.lut)
+        if mode == 'lut':
+            self.epd_init_waveform(lut)
+        elif mode == 'fast':
+            self.epd_init_fast()
+        elif mode == 'init':
+            self.epd_init()
+        else:
+            self.epd_init_part()
 
-        self.epd_w21_write_cmd(0x07)  # Deep sleep
-        self.epd_w21_write_data(0xA5)
+    @_timed_phase('init')
+    def epd_init(self, force: bool = False) -> None:
+        """
+        Initialize the OTP full-refresh mode.
 
-    def epd_init(self) -> None:
+        :param force: Reset and re-init even if the mode is already active.
+        """
+        if not force and self._resume_mode('init'):
+            return
         self.epd_w21_init()  # Reset the e-paper display
 
-        self.epd_w21_write_cmd(0x04)  # Power on
-        self.lcd_chkstatus()  # Implement this to check the display's busy status
+        self.power_on()
+
+        # VCOM and data interval setting
+        self.write_register(0x50, bytes([0x97]))
+        self.mode = 'init'
 
-        self.epd_w21_write_cmd(0x50)  # VCOM and data interval setting
-        self.epd_w21_write_data(0x97)  # Settings for your display
+    @_timed_phase('init')
+    def epd_init_fast(self, force: bool = False) -> None:
+        """
+        Initialize the OTP fast-refresh mode.
 
-    def epd_init_fast(self) -> None:
+        :param force: Reset and re-init even if the mode is already active.
+        """
+        if not force and self._resume_mode('fast'):
+            return
         self.epd_w21_init()  # Reset the e-paper display
 
-        self.epd_w21_write_cmd(0x04)  # Power on
-        self.lcd_chkstatus()  # Implement this to check the display's busy status
+        self.power_on()
 
-        self.epd_w21_write_cmd(0xE0)
-        self.epd_w21_write_data(0x02)
+        self.run_program(INIT_FAST_PROGRAM)
+        self.mode = 'fast'
 
-        self.epd_w21_write_cmd(0xE5)
-        self.epd_w21_write_data(0x5A)
+    @_timed_phase('init')
+    def epd_init_part(self, force: bool = False) -> None:
+        """
+        Initialize the OTP partial-refresh mode.
 
-    def epd_init_part(self) -> None:
+        :param force: Reset and re-init even if the mode is already active.
+        """
+        if not force and self._resume_mode('part'):
+            return
         self.epd_w21_init()  # Reset the e-paper display
 
-        self.epd_w21_write_cmd(0x04)  # Power on
-        self.lcd_chkstatus()  # Implement this to check the display's busy status
+        self.power_on()
 
-        self.epd_w21_write_cmd(0xE0)
-        self.epd_w21_write_data(0x02)
+        self.run_program(INIT_PART_PROGRAM)
+        self.mode = 'part'
 
-        self.epd_w21_write_cmd(0xE5)
-        self.epd_w21_write_data(0x6E)
-
-        self.epd_w21_write_cmd(0x50)
-        self.epd_w21_write_data(0xD7)
+    def power_on(self) -> None:
+        self.write_register(0x04)
+        self.lcd_chkstatus()
+        self.powered = True
 
     def power_off(self) -> None:
-        self.epd_w21_write_cmd(0x02)
+        self.write_register(0x02)
         self.lcd_chkstatus()
+        self.powered = False
 
-    def write_full_lut(self) -> None:
-        self.epd_w21_write_cmd(0x20)  # Write VCOM register
-        for i in range(42):
-            self.epd_w21_write_data(self.LUT_ALL[i])
-
-        self.epd_w21_write_cmd(0x21)  # Write LUTWW register
-        for i in range(42, 84):
-            self.epd_w21_write_data(self.LUT_ALL[i])
+    def build_lut_program(self) -> List[Tuple[int, bytes]]:
+        """
+        Compile the 4-gray LUT into the five LUT register writes (VCOM, WW, R, W, B).
 
-        self.epd_w21_write_cmd(0x22)  # Write LUTR register
-        for i in range(84, 126):
-            self.epd_w21_write_data(self.LUT_ALL[i])
+        :return: The register writes uploading the full LUT.
+        """
+        return get_waveform('4g').lut_program()
 
-        self.epd_w21_write_cmd(0x23)  # Write LUTW register
-        for i in range(126, 168):
-            self.epd_w21_write_data(self.LUT_ALL[i])
+    def build_init_4g_program(self) -> List[Tuple[int, bytes]]:
+        """
+        Compile the 4-gray init sequence, LUT upload included, into register writes.
 
-        self.epd_w21_write_cmd(0x24)  # Write LUTB register
-        for i in range(168, 210):
-            self.epd_w21_write_data(self.LUT_ALL[i])
+        :return: The register writes sent between reset and power on.
+        """
+        return get_waveform('4g').init_program()
 
-    def epd_w21_init_4g(self) -> None:
+    def write_full_lut(self) -> None:
+        self.run_program(self.build_lut_program())
+        self.lut = '4g'
+
+    def epd_w21_init_4g(self, force: bool = False) -> None:
+        """
+        Initialize the 4-gray mode with the '4g' waveform uploaded to the LUT registers.
+
+        :param force: Reset and re-init even if the mode is already active.
+        """
+        self.epd_init_waveform('4g', force)
+
+    @_timed_phase('init')
+    def epd_init_waveform(self, name: str, force: bool = False) -> None:
+        """
+        Load a registered waveform (see distiller.drivers.waveforms) into the LUT registers.
+
+        Switching between register waveforms on a powered panel only rewrites
+        the LUTs, the reset and full init happen when coming from an OTP mode,
+        sleep or an unknown state. 1-bit frames are passed to pic_display the
+        same way as with the OTP modes.
+
+        :param name: The waveform name, e.g. '4g', 'partial_fast' or 'a2'.
+        :param force: Reset and re-init even if the waveform is already loaded.
+        :raises ValueError: If no waveform is registered under that name.
+        """
+        waveform = get_waveform(name)
+        if not force and self._resume_mode('lut'):
+            if self.lut != name:
+                self.run_program(waveform.switch_program())
+                self.lut = name
+                self._luts_swapped = False
+            self._flip_rows = not waveform.gray
+            return
         self.epd_w21_init()  # Reset the e-paper display
 
-        # Panel Setting
-        self.epd_w21_write_cmd(0x00)
-        self.epd_w21_write_data(0xFF)  # LUT from MCU
-        self.epd_w21_write_data(0x0D)
-
-        # Power Setting
-        self.epd_w21_write_cmd(0x01)
-        self.epd_w21_write_data(0x03)  # Enable internal VSH, VSL, VGH, VGL
-        self.epd_w21_write_data(self.LUT_ALL[211])  # VGH=20V, VGL=-20V
-        self.epd_w21_write_data(self.LUT_ALL[212])  # VSH=15V
-        self.epd_w21_write_data(self.LUT_ALL[213])  # VSL=-15V
-        self.epd_w21_write_data(self.LUT_ALL[214])  # VSHR
-
-        # Booster Soft Start
-        self.epd_w21_write_cmd(0x06)
-        self.epd_w21_write_data(0xD7)  # D7
-        self.epd_w21_write_data(0xD7)  # D7
-        self.epd_w21_write_data(0x27)  # 2F
-
-        # PLL Control - Frame Rate
-        self.epd_w21_write_cmd(0x30)
-        self.epd_w21_write_data(self.LUT_ALL[210])  # PLL
-
-        # CDI Setting
-        self.epd_w21_write_cmd(0x50)
-        self.epd_w21_write_data(0x57)
-
-        # TCON Setting
-        self.epd_w21_write_cmd(0x60)
-        self.epd_w21_write_data(0x22)
-
-        # Resolution Setting
-        self.epd_w21_write_cmd(0x61)
-        self.epd_w21_write_data(0xF0)  # HRES[7:3] - 240
-        self.epd_w21_write_data(0x01)  # VRES[15:8] - 320
-        self.epd_w21_write_data(0xA0)  # VRES[7:0]
-
-        self.epd_w21_write_cmd(0x65)
-        # Additional resolution setting, if needed
-        self.epd_w21_write_data(0x00)
-
-        # VCOM_DC Setting
-        self.epd_w21_write_cmd(0x82)
-        self.epd_w21_write_data(self.LUT_ALL[215])  # -2.0V
-
-        # Power Saving Register
-        self.epd_w21_write_cmd(0xE3)
-        self.epd_w21_write_data(0x88)  # VCOM_W[3:0], SD_W[3:0]
-
-        # LUT Setting
-        self.write_full_lut()
+        program = self._programs.get(waveform)
+        if program is None:
+            program = self._programs[waveform] = waveform.init_program()
+        self.run_program(program)
+        self.lut = name
 
         # Power ON
-        self.epd_w21_write_cmd(0x04)
-        self.lcd_chkstatus()  # Check if the display is ready
+        self.power_on()
+        self.mode = 'lut'
+        self._flip_rows = not waveform.gray
+
+    def refresh(self, blocking: bool = True) -> Future:
+        """
+        Trigger a display refresh of the data in controller RAM.
+
+        :param blocking: Wait for BUSY here. Otherwise return as soon as the
+                         refresh is triggered and wait for BUSY in the background.
+        :return: A future that completes when the panel is idle again.
+        """
+        self.write_register(0x12)
+        self.delay_xms(1)  # Necessary delay for the display refresh
+        if blocking:
+            self._wait_refresh(self._timing)  # Check if the display is ready
+            return self._done()
+        self._pending = self._busy_executor.submit(self._wait_refresh, self._timing)
+        return self._pending
+
+    def _wait_refresh(self, timing: UpdateTiming) -> None:
+        """ Wait for a refresh and count the busy time towards the update that started it """
+        self.lcd_chkstatus()
+        timing.busy += self.last_busy_duration
+        if self.trace is not None:
+            self.trace(TraceEvent(time.monotonic(), 'busy', 'refresh', self.last_busy_duration))
+
+    @staticmethod
+    def _done() -> Future:
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def _flip_plane(self, data: bytes) -> bytes:
+        """ Reverse the row order of a 1-bit plane """
+        width_bytes = (self.EPD_WIDTH + 7) // 8
+        return _as_uint8(data).reshape(-1, width_bytes)[::-1].tobytes()
+
+    def _wire_plane(self, data: bytes) -> bytes:
+        """ Reorder the rows of a 1-bit plane for the scan direction of the loaded waveform """
+        return self._flip_plane(data) if self._flip_rows else data
+
+    @property
+    def rows_reversed(self) -> bool:
+        """Whether the loaded waveform scans 1-bit frames top row first, the reverse of oldData."""
+        return self._flip_rows
+
+    def _exit_partial_window(self) -> None:
+        if self._partial_window:
+            self.write_register(0x92)  # Partial out
+            self._partial_window = False
+
+    def pic_display_4g(self, datas: FrameBuffer, blocking: bool = True) -> Future:
+        """
+        Display a 2-bit frame with the 4-gray waveform.
+
+        :param datas: The packed 2-bit frame (24960 bytes).
+        :param blocking: Wait for the refresh to finish, see refresh().
+        :return: A future that completes when the panel is idle again.
+        """
+        old_plane, new_plane = split_4g_planes(datas)
+        self._exit_partial_window()
 
-    def pic_display_4g(self, datas: List[int]) -> None:
         # Command to start transmitting old data
-        buffer = []
-        self.epd_w21_write_cmd(0x10)
-        if _ROCK:
-            self.RockGPIO.output(self.RK_DC_PIN, Value.ACTIVE)
-        else:
-            self.GPIO.output(self.DC_PIN, GPIO.HIGH)  # Data mode
-
-        print("Start Old Data Transmission")
-        # Iterate over each byte of the image data
-        for i in range(12480):  # Assuming 416x240 resolution, adjust accordingly
-            temp3 = 0
-            for j in range(2):  # For each half-byte in the data
-                temp1 = datas[i * 2 + j]
-                for k in range(4):  # For each bit in the half-byte
-                    temp2 = temp1 & 0xC0
-                    if temp2 == 0xC0:
-                        temp3 |= 0x01  # White
-                    elif temp2 == 0x00:
-                        temp3 |= 0x00  # Black
-                    elif temp2 == 0x80:
-                        temp3 |= 0x01  # Gray1
-                    elif temp2 == 0x40:
-                        temp3 |= 0x00  # Gray2
-
-                    if j == 0:
-                        temp1 <<= 2
-                        temp3 <<= 1
-                    if j == 1 and k != 3:
-                        temp1 <<= 2
-                        temp3 <<= 1
-            buffer.append(temp3)
-        self.spi.xfer3(buffer, self.spi.max_speed_hz, 1, 8)
-
-        buffer = []
-        print("Start New Data Transmission")
+        self.write_register(0x10, old_plane)
+
         # Command to start transmitting new data
-        self.epd_w21_write_cmd(0x13)
-        if _ROCK:
-            self.RockGPIO.output(self.RK_DC_PIN, Value.ACTIVE)
-        else:
-            self.GPIO.output(self.DC_PIN, GPIO.HIGH)  # Data mode
-
-        for i in range(12480):  # Repeat the process for new data
-            temp3 = 0
-            for j in range(2):
-                temp1 = datas[i * 2 + j]
-                for k in range(4):
-                    temp2 = temp1 & 0xC0
-                    # The logic for determining color values remains the same
-                    if temp2 == 0xC0:
-                        temp3 |= 0x01  # White
-                    elif temp2 == 0x00:
-                        temp3 |= 0x00  # Black
-                    elif temp2 == 0x80:
-                        temp3 |= 0x00  # Gray1
-                    elif temp2 == 0x40:
-                        temp3 |= 0x01  # Gray2
-
-                    if j == 0:
-                        temp1 <<= 2
-                        temp3 <<= 1
-                    if j == 1 and k != 3:
-                        temp1 <<= 2
-                        temp3 <<= 1
-            buffer.append(temp3)
-
-        self.spi.xfer3(buffer, self.spi.max_speed_hz, 1, 8)
+        self.write_register(0x13, new_plane)
+        self._track_4g(old_plane, new_plane)
 
         # Refresh command
-        print("Refreshing")
-        self.epd_w21_write_cmd(0x12)
-        self.delay_xms(1)  # Necessary delay for the display refresh
-        self.lcd_chkstatus()  # Check the display status
+        return self.refresh(blocking)
+
+    def pic_display_4g_stream(self, bands: Iterable[bytes], blocking: bool = True) -> Future:
+        """
+        Display a 2-bit frame whose bands are converted while it is being sent.
+
+        The bands are split into planes on the stream thread and every old plane
+        band goes out as soon as it is ready, the new plane follows once the
+        frame is complete.
+
+        :param bands: Bands of whole rows of the packed 2-bit frame, top row
+                      first, together 24960 bytes.
+        :param blocking: Wait for the refresh to finish, see refresh().
+        :return: A future that completes when the panel is idle again.
+        """
+        planes = self._prefetch(split_4g_planes(band) for band in bands)
+        self._exit_partial_window()
+        new_bands: List[bytes] = []
+
+        def old_bands() -> Iterator[bytes]:
+            for old_band, new_band in planes:
+                new_bands.append(new_band)
+                yield old_band
+
+        try:
+            old_plane = self.write_register_stream(0x10, old_bands())
+            if len(old_plane) != len(_BLANK_PLANE):
+                raise ValueError(f"Streamed 2-bit frame has {len(old_plane) * 2} bytes, "
+                                 f"expected {len(_BLANK_PLANE) * 2}")
+            new_plane = self.write_register_stream(0x13, new_bands)
+        except BaseException:
+            # Either plane may be partly overwritten
+            self._forget_ram()
+            raise
+        self._track_4g(old_plane, new_plane)
+        return self.refresh(blocking)
+
+    def _track_4g(self, old_plane: bytes, new_plane: bytes) -> None:
+        self._ram = {0x10: old_plane, 0x13: new_plane}
+        # The high bit of every pixel is the 1-bit approximation of the frame
+        # (white and light gray white), stored bottom row first like 1-bit frames
+        # so the next 1-bit update can start from it without clearing the panel
+        self.oldData = self._flip_plane(old_plane)
+
+    def pic_display_4g_async(self, datas: FrameBuffer) -> Future:
+        """Send a 2-bit frame and return once it is transferred, see pic_display_4g."""
+        return self.pic_display_4g(datas, blocking=False)
+
+    def pic_display(self, new_data: FrameBuffer, region: bool = False, blocking: bool = True) -> Future:
+        """
+        Display a 1-bit frame with the currently loaded waveform.
+
+        :param new_data: The packed 1-bit frame (12480 bytes).
+        :param region: Only send and refresh the window that differs from oldData.
+        :param blocking: Wait for the refresh to finish, see refresh().
+        :return: A future that completes when the panel is idle again.
+        """
+        new_data = _to_bytes(new_data)
+        if region:
+            window = changed_window(self.oldData, new_data, self.EPD_WIDTH)
+            if window is None:
+                return self._done()  # Nothing changed, the panel already shows this frame
+            # With no plane RAM holding the frame on the panel, a full transfer
+            # makes it resident again
+            ram_unknown = self._reuse_active() and self._resident_plane(self._wire_plane(self.oldData)) is None
+            if window_area(window) <= self.region_max_fraction * len(new_data) and not ram_unknown:
+                return self.pic_display_window(new_data, window, blocking)
+
+        self._exit_partial_window()
+
+        # Transfer old data, unless the controller already holds it
+        wire_old, wire_new = self._wire_plane(self.oldData), self._wire_plane(new_data)
+        register = self._new_plane_register(wire_old)
 
-    def pic_display(self, new_data: List[int]) -> None:
-        # Assuming oldData is globally defined or accessible
+        # Transfer new data
+        self.write_register(register, wire_new)
+        self.oldData = new_data
+        self._ram[register] = wire_new
 
-        # Transfer old data
-        self.epd_w21_write_cmd(0x10)
-        if _ROCK:
-            self.RockGPIO.output(self.RK_DC_PIN, Value.ACTIVE)
-        else:
-            self.GPIO.output(self.DC_PIN, GPIO.HIGH)  # Data mode
-        self.spi.xfer3(self.oldData, self.spi.max_speed_hz, 1, 8)
+        # Refresh display
+        return self.refresh(blocking)
+
+    def pic_display_stream(self, bands: Iterable[bytes], blocking: bool = True) -> Future:
+        """
+        Display a 1-bit frame whose bands are converted while it is being sent.
+
+        The bands are produced on the stream thread, each one is sent as soon as
+        it is ready, so the conversion overlaps the old plane transfer and the
+        transfer of the bands before it. The frame is only known once its last
+        band arrived, so this is always a full-frame update.
+
+        :param bands: Bands of whole rows of the packed 1-bit frame in the order
+                      the loaded waveform scans them (see rows_reversed),
+                      together 12480 bytes.
+        :param blocking: Wait for the refresh to finish, see refresh().
+        :return: A future that completes when the panel is idle again.
+        """
+        bands = self._prefetch(bands)
+        self._exit_partial_window()
+
+        # Transfer old data, unless the controller already holds it
+        register = self._new_plane_register(self._wire_plane(self.oldData))
+
+        # Transfer new data band by band
+        try:
+            wire_new = self.write_register_stream(register, bands)
+            if len(wire_new) != len(_BLANK_PLANE):
+                raise ValueError(f"Streamed 1-bit frame has {len(wire_new)} bytes, expected {len(_BLANK_PLANE)}")
+        except BaseException:
+            # The plane may be partly overwritten
+            self._ram[register] = None
+            raise
+        self.oldData = self._wire_plane(wire_new)
+        self._ram[register] = wire_new
 
-        # Transfer new data
-        self.epd_w21_write_cmd(0x13)
-        if _ROCK:
-            self.RockGPIO.output(self.RK_DC_PIN, Value.ACTIVE)
-        else:
-            self.GPIO.output(self.DC_PIN, GPIO.HIGH)  # Data mode
-        self.spi.xfer3(new_data, self.spi.max_speed_hz, 1, 8)
-        self.oldData = new_data.copy()
+        # Refresh display
+        return self.refresh(blocking)
+
+    def _reuse_active(self) -> bool:
+        """ Whether plane RAM is reused, only with reuse_ram and a 1-bit register waveform loaded """
+        return self.reuse_ram and self.mode == 'lut' and self._flip_rows
+
+    def _resident_plane(self, wire_old: bytes) -> Optional[int]:
+        """ The plane register known to hold the frame on the panel, preferring the new plane """
+        for register in (0x13, 0x10):
+            if self._ram[register] == wire_old:
+                return register
+        return None
+
+    def _orient_luts(self, swapped: bool) -> None:
+        """ Load the R and W LUTs of the 1-bit waveform exchanged or in place, see swap_transitions """
+        if self._luts_swapped != swapped:
+            self.run_program(get_waveform(self.lut).transition_program(swapped))
+            self._luts_swapped = swapped
+
+    def _new_plane_register(self, wire_old: bytes) -> int:
+        """
+        Get the frame on the panel into a plane RAM and pick the plane for the next frame.
+
+        With reuse active, a plane already holding the frame on the panel is kept
+        and the next frame goes to the other one, with the R and W LUTs exchanged
+        when that is the old plane. Otherwise the frame is sent to the old plane.
+
+        :param wire_old: The frame on the panel, in wire order.
+        :return: The register receiving the next frame, 0x13 or 0x10.
+        """
+        resident = self._resident_plane(wire_old) if self._reuse_active() else None
+        if resident is not None:
+            self.plane_uploads_saved += 1
+            self._orient_luts(resident == 0x13)
+            return 0x10 if resident == 0x13 else 0x13
+        self._orient_luts(False)
+        self.write_register(0x10, wire_old)
+        self._ram[0x10] = wire_old
+        return 0x13
+
+    def pic_display_async(self, new_data: FrameBuffer, region: bool = False) -> Future:
+        """Send a 1-bit frame and return once it is transferred, see pic_display."""
+        return self.pic_display(new_data, region, blocking=False)
+
+    def pic_display_window(self, new_data: FrameBuffer, window: Tuple[int, int, int, int],
+                           blocking: bool = True) -> Future:
+        """
+        Send and refresh only a window of the frame using the partial-window commands.
+
+        The controller stays in partial-window mode afterwards, it is left before
+        the next full-frame transfer or reset.
+
+        :param new_data: The full packed 1-bit frame (12480 bytes).
+        :param window: (x_start, x_end, y_start, y_end) with x in bytes (8-pixel
+                       columns) and y in rows, end exclusive.
+        :param blocking: Wait for the refresh to finish, see refresh().
+        :return: A future that completes when the panel is idle again.
+        """
+        x_start, x_end, y_start, y_end = window
+        width_bytes = (self.EPD_WIDTH + 7) // 8
+        new_data = _to_bytes(new_data)
+        # The new rows go to a plane holding the frame on the panel, so outside the
+        # window it holds the new frame afterwards and stays resident
+        resident = self._resident_plane(self._wire_plane(self.oldData)) if self._reuse_active() else None
+        new_register = 0x10 if resident == 0x10 else 0x13
+        old_rows = _as_uint8(self.oldData).reshape(-1, width_bytes)[y_start:y_end, x_start:x_end]
+        new_rows = _as_uint8(new_data).reshape(-1, width_bytes)[y_start:y_end, x_start:x_end]
+        if self._flip_rows:
+            old_rows, new_rows = old_rows[::-1], new_rows[::-1]
+            y_start, y_end = self.EPD_HEIGHT - y_end, self.EPD_HEIGHT - y_start
+
+        if not self._partial_window:
+            self.write_register(0x91)  # Partial in
+            self._partial_window = True
+        self.write_register(0x90, bytes([
+            x_start * 8, x_end * 8 - 1,  # HRST[7:3], HRED[7:3]
+            y_start >> 8, y_start & 0xFF,  # VRST[8:0]
+            (y_end - 1) >> 8, (y_end - 1) & 0xFF,  # VRED[8:0]
+            0x01,  # Gates scan both inside and outside of the window
+        ]))
+        self._orient_luts(new_register == 0x10)
+        old_register = 0x13 if new_register == 0x10 else 0x10
+        self.write_register(old_register, old_rows.tobytes())
+        self.write_register(new_register, new_rows.tobytes())
+        self.oldData = new_data
+        # Only the window of the plane RAM changed
+        for register, rows in ((old_register, old_rows), (new_register, new_rows)):
+            if self._ram[register] is not None:
+                ram = _as_uint8(self._ram[register]).reshape(-1, width_bytes).copy()
+                ram[y_start:y_end, x_start:x_end] = rows
+                self._ram[register] = ram.tobytes()
 
         # Refresh display
-        self.epd_w21_write_cmd(0x12)
-        self.delay_xms(1)  # Necessary delay for the display refresh
-        self.lcd_chkstatus()  # Check if the display is ready
+        return self.refresh(blocking)
 
     def pic_display_clear(self, poweroff: bool = False) -> None:
-        # Transfer old data
-        self.epd_w21_write_cmd(0x10)
-        if _ROCK:
-            self.RockGPIO.output(self.RK_DC_PIN, Value.ACTIVE)
-        else:
-            self.GPIO.output(self.DC_PIN, GPIO.HIGH)  # Data mode
-        self.spi.xfer3(self.oldData, self.spi.max_speed_hz, 1, 8)
+        self._exit_partial_window()
+
+        # Transfer old data, unless the controller already holds it
+        register = self._new_plane_register(self._wire_plane(self.oldData))
 
         # Transfer new data, setting all to 0xFF (white or clear)
-        self.epd_w21_write_cmd(0x13)
-        if _ROCK:
-            self.RockGPIO.output(self.RK_DC_PIN, Value.ACTIVE)
-        else:
-            self.GPIO.output(self.DC_PIN, GPIO.HIGH)  # Data mode
-        self.spi.xfer3([0] * 12480, self.spi.max_speed_hz, 1, 8)
-        self.oldData = [0] * 12480
+        self.write_register(register, _BLANK_PLANE)
+        self.oldData = _BLANK_PLANE
+        self._ram[register] = _BLANK_PLANE
 
         # Refresh the display
-        self.epd_w21_write_cmd(0x12)
-        self.delay_xms(1)  # Ensure a small delay for the display to process
-        self.lcd_chkstatus()  # Check the display status
+        self.refresh()
 
         if poweroff:
             self.power_off()  # Optionally power off the display after clearing
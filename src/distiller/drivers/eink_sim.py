@@ -0,0 +1,333 @@
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from .waveforms import LUT_COUNT, Waveform, find_waveform, swap_transitions
+
+# Modeled BUSY durations in seconds, per controller operation / refresh type
+DEFAULT_TIMING: Dict[str, float] = {
+    'power_on': 0.03,
+    'power_off': 0.03,
+    'full': 3.0,      # OTP waveform after reset
+    'fast': 1.5,      # OTP fast waveform (epd_init_fast)
+    'partial': 0.45,  # OTP partial waveform (epd_init_part)
+    '4g': 2.2,        # 4-gray waveform uploaded to the LUT registers
+    'partial_fast': 0.3,  # registered 1-bit waveforms, see distiller.drivers.waveforms
+    'a2': 0.12,
+    'lut': 0.6,       # any other 1-bit waveform uploaded to the LUT registers
+}
+
+
+@dataclass
+class Transaction:
+    """One command on the wire with the data bytes that followed it."""
+    timestamp: float
+    command: int
+    payload: bytes
+
+
+class SimulatedSpi:
+    """spidev.SpiDev stand-in that feeds every byte to a SimulatedPanel."""
+
+    def __init__(self, panel: "SimulatedPanel") -> None:
+        self.panel = panel
+        self.max_speed_hz = 0
+        self.mode = 0
+
+    def open(self, bus: int, device: int) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def writebytes(self, values) -> None:
+        self.panel._receive(bytes(values))
+
+    def writebytes2(self, values) -> None:
+        self.panel._receive(bytes(values))
+
+    def xfer2(self, values) -> List[int]:
+        self.panel._receive(bytes(values))
+        return [0] * len(values)
+
+    def xfer3(self, values, *args) -> List[int]:
+        return self.xfer2(values)
+
+
+class SimulatedGPIO:
+    """RPi.GPIO compatible pin API wired to a SimulatedPanel."""
+    BCM = 11
+    OUT = 0
+    IN = 1
+    PUD_UP = 22
+    LOW = 0
+    HIGH = 1
+    RISING = 31
+
+    def __init__(self, panel: "SimulatedPanel", dc_pin: int = 6, rst_pin: int = 13, busy_pin: int = 9) -> None:
+        self.panel = panel
+        self.dc_pin = dc_pin
+        self.rst_pin = rst_pin
+        self.busy_pin = busy_pin
+        self.levels: Dict[int, int] = {}
+
+    def setwarnings(self, flag: bool) -> None:
+        pass
+
+    def setmode(self, mode: int) -> None:
+        pass
+
+    def setup(self, pin: int, direction: int, pull_up_down: Optional[int] = None) -> None:
+        self.levels.setdefault(pin, self.HIGH if pull_up_down == self.PUD_UP else self.LOW)
+
+    def output(self, pin: int, value) -> None:
+        value = int(bool(value))
+        self.panel.gpio_writes += 1
+        if pin == self.rst_pin and value and not self.levels.get(pin, self.HIGH):
+            self.panel._reset()
+        self.levels[pin] = value
+
+    def input(self, pin: int) -> int:
+        if pin == self.busy_pin:
+            return self.LOW if self.panel.is_busy() else self.HIGH
+        return self.levels.get(pin, self.LOW)
+
+    def wait_for_edge(self, pin: int, edge: int, timeout: Optional[int] = None) -> Optional[int]:
+        remaining = self.panel.busy_remaining()
+        if timeout is not None and remaining > timeout / 1000:
+            time.sleep(timeout / 1000)
+            return None
+        time.sleep(remaining)
+        return pin
+
+    def cleanup(self, *args) -> None:
+        pass
+
+
+class SimulatedPanel:
+    """
+    Headless model of the 240x416 panel and its controller.
+
+    Pass it as the backend of EinkDSP (or Eink) to run the display stack without
+    a device: every command and data transfer is recorded, BUSY is held low for a
+    modeled duration per refresh type, and the refreshed framebuffer can be
+    dumped as an image.
+
+    Assumes a set bit is a white pixel. With the OTP waveforms frames are 1-bit
+    and fed bottom row first. With register LUTs the rows are fed top row first
+    when the panel setting (0x00) has UD set, and LUTs matching a registered
+    waveform are decoded as that waveform says (4-gray or 1-bit) and timed by
+    its name, a 1-bit waveform with its R and W LUTs exchanged showing the old
+    plane. Unknown LUTs are decoded as 4-gray when UD is set, 1-bit otherwise.
+    """
+
+    def __init__(self, width: int = 240, height: int = 416,
+                 timing: Optional[Dict[str, float]] = None, time_scale: float = 1.0) -> None:
+        """
+        :param width: The panel width in pixels.
+        :param height: The panel height in pixels.
+        :param timing: Overrides for DEFAULT_TIMING.
+        :param time_scale: Multiplier applied to modeled BUSY durations before
+                           BUSY is actually held low, 0 to never block.
+        """
+        self.width = width
+        self.height = height
+        self.timing = {**DEFAULT_TIMING, **(timing or {})}
+        self.time_scale = time_scale
+        self.spi = SimulatedSpi(self)
+        self.gpio = SimulatedGPIO(self)
+
+        self.transactions: List[Transaction] = []
+        # Protocol misuse noticed by the model, e.g. refreshing while powered off
+        self.errors: List[str] = []
+        self.busy_log: List[Tuple[str, float]] = []
+        self.refresh_count = 0
+        self.resets = 0
+        self.spi_calls = 0
+        self.bytes_sent = 0
+        self.gpio_writes = 0
+
+        plane_size = (width + 7) // 8 * height
+        self.ram: Dict[int, bytearray] = {0x10: bytearray(plane_size), 0x13: bytearray(plane_size)}
+        self.framebuffer = np.full((height, width), 255, dtype=np.uint8)
+        self._busy_until = 0.0
+        self._reset()
+        self.resets = 0
+
+    # Wire side
+
+    def _reset(self) -> None:
+        self.resets += 1
+        self.registers: Dict[int, bytes] = {}
+        self.powered = False
+        self.asleep = False
+        self.partial = False
+        self.window = (0, self.width, 0, self.height)
+        self._current: Optional[Transaction] = None
+        self._cursor = 0
+
+    def _receive(self, data: bytes) -> None:
+        self.spi_calls += 1
+        self.bytes_sent += len(data)
+        if self.asleep:
+            self.errors.append("SPI transfer while in deep sleep")
+            return
+        if self.gpio.levels.get(self.gpio.dc_pin, self.gpio.LOW):
+            self._data(data)
+        else:
+            for command in data:
+                self._command(command)
+
+    def _command(self, command: int) -> None:
+        self._finish()
+        if self.is_busy():
+            self.errors.append(f"command 0x{command:02X} sent while BUSY")
+        self._current = Transaction(time.monotonic(), command, b'')
+        self.transactions.append(self._current)
+        self._cursor = 0
+        if command == 0x04:
+            self.powered = True
+            self._busy('power_on')
+        elif command == 0x02:
+            self.powered = False
+            self._busy('power_off')
+        elif command == 0x12:
+            if self.powered:
+                self._refresh()
+            else:
+                self.errors.append("refresh while powered off")
+        elif command == 0x91:
+            self.partial = True
+        elif command == 0x92:
+            self.partial = False
+            self.window = (0, self.width, 0, self.height)
+
+    def _data(self, data: bytes) -> None:
+        if self._current is None:
+            self.errors.append("data without a command")
+            return
+        self._current.payload += data
+        if self._current.command in self.ram:
+            self._write_ram(self.ram[self._current.command], data)
+        elif self._current.command == 0x07 and self._current.payload == bytes([0xA5]):
+            self._finish()
+            self.asleep = True
+            self.powered = False
+
+    def _finish(self) -> None:
+        """Apply the parameters of the command that just completed."""
+        if self._current is None:
+            return
+        command, payload = self._current.command, self._current.payload
+        if command not in self.ram:
+            self.registers[command] = payload
+        if command == 0x90 and len(payload) >= 6:
+            self.window = (payload[0] & 0xF8, (payload[1] | 0x07) + 1,
+                           (payload[2] << 8) | payload[3], ((payload[4] << 8) | payload[5]) + 1)
+        self._current = None
+
+    def _write_ram(self, plane: bytearray, data: bytes) -> None:
+        x_start, x_end, y_start, y_end = self.window if self.partial else (0, self.width, 0, self.height)
+        window_bytes = (x_end - x_start) // 8
+        rows = np.frombuffer(plane, dtype=np.uint8).reshape(self.height, -1)
+        index = np.arange(self._cursor, self._cursor + len(data))
+        row, col = np.divmod(index, window_bytes)
+        inside = row < y_end - y_start
+        rows[y_start + row[inside], x_start // 8 + col[inside]] = np.frombuffer(data, dtype=np.uint8)[inside]
+        self._cursor += len(data)
+
+    # Panel side
+
+    def _panel_setting(self) -> int:
+        panel_setting = self.registers.get(0x00)
+        return panel_setting[0] if panel_setting else 0
+
+    def _luts(self) -> bytes:
+        return b''.join(self.registers.get(0x20 + i, b'') for i in range(LUT_COUNT))
+
+    def register_waveform(self) -> Optional[Waveform]:
+        """The registered waveform held by the LUT registers, as is or swapped, None if unknown."""
+        luts = self._luts()
+        return find_waveform(luts) or find_waveform(swap_transitions(luts))
+
+    def transitions_swapped(self) -> bool:
+        """Whether the LUT registers hold a registered 1-bit waveform with its R and W LUTs exchanged."""
+        luts = self._luts()
+        waveform = find_waveform(swap_transitions(luts))
+        return waveform is not None and not waveform.gray and find_waveform(luts) is None
+
+    def refresh_kind(self) -> str:
+        """Name of the waveform the next refresh would use, see DEFAULT_TIMING."""
+        panel_setting = self._panel_setting()
+        if panel_setting & 0x20:  # REG: LUT from registers
+            waveform = self.register_waveform()
+            if waveform is not None:
+                return waveform.name
+            return '4g' if panel_setting & 0x08 else 'lut'
+        override = self.registers.get(0xE5)
+        if override == bytes([0x5A]):
+            return 'fast'
+        if override == bytes([0x6E]):
+            return 'partial'
+        return 'full'
+
+    def _refresh(self) -> None:
+        kind = self.refresh_kind()
+        old = np.unpackbits(np.frombuffer(self.ram[0x10], dtype=np.uint8)).reshape(self.height, -1)[:, :self.width]
+        new = np.unpackbits(np.frombuffer(self.ram[0x13], dtype=np.uint8)).reshape(self.height, -1)[:, :self.width]
+        waveform = self.register_waveform() if self._panel_setting() & 0x20 else None
+        if (waveform.gray if waveform is not None else kind == '4g'):
+            # The old plane carries the high bit, the new plane the low bit
+            pixels = (old * 170 + new * 85).astype(np.uint8)
+        elif waveform is not None and self.transitions_swapped():
+            # Every pixel is driven to its old plane level, see swap_transitions
+            pixels = old * np.uint8(255)
+        else:
+            pixels = new * np.uint8(255)
+
+        flipped = not self._panel_setting() & 0x08  # UD
+        if flipped:
+            pixels = pixels[::-1]
+        if self.partial:
+            x_start, x_end, y_start, y_end = self.window
+            rows = slice(self.height - y_end, self.height - y_start) if flipped else slice(y_start, y_end)
+            self.framebuffer[rows, x_start:x_end] = pixels[rows, x_start:x_end]
+        else:
+            self.framebuffer[:, :] = pixels
+        self.refresh_count += 1
+        self._busy(kind)
+
+    def _busy(self, kind: str) -> None:
+        duration = self.timing.get(kind, self.timing['lut'])
+        self.busy_log.append((kind, duration))
+        self._busy_until = time.monotonic() + duration * self.time_scale
+
+    def busy_remaining(self) -> float:
+        return max(0.0, self._busy_until - time.monotonic())
+
+    def is_busy(self) -> bool:
+        return self.busy_remaining() > 0
+
+    def modeled_busy_time(self) -> float:
+        """Total modeled BUSY time in seconds, independent of time_scale."""
+        return sum(duration for _, duration in self.busy_log)
+
+    def to_image(self) -> Image.Image:
+        """The content of the panel after the last refresh, top row first."""
+        return Image.fromarray(self.framebuffer, 'L')
+
+    def save(self, path: str) -> None:
+        self.to_image().save(path)
+
+    def clear_log(self) -> None:
+        """Forget recorded transactions and counters, keeping the panel state."""
+        self.transactions.clear()
+        self.errors.clear()
+        self.busy_log.clear()
+        self.refresh_count = 0
+        self.spi_calls = 0
+        self.bytes_sent = 0
+        self.gpio_writes = 0
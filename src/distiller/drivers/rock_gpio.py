@@ -1,34 +1,103 @@
-from gpiod.line import Direction, Value, Bias
+from datetime import timedelta
+from gpiod.line import Direction, Value, Bias, Edge
 import gpiod
 
+class RockPin:
+    """
+    A pin resolved once by RockGPIO.setup: its line request and line offset.
+
+    Use it on hot paths, RockGPIO.output/input look the pin up by name on every call.
+    """
+    __slots__ = ('name', 'request', 'offset')
+
+    def __init__(self, name: str, request: gpiod.LineRequest, offset: int) -> None:
+        self.name = name
+        self.request = request
+        self.offset = offset
+
+    def set(self, value: Value) -> None:
+        self.request.set_value(self.offset, value)
+
+    def get(self) -> Value:
+        return self.request.get_value(self.offset)
+
+    def clear_edge_events(self) -> None:
+        """Drop edge events queued on an input set up with edge detection."""
+        while self.request.wait_edge_events(timedelta(0)):
+            self.request.read_edge_events()
+
+    def wait_for_edge(self, timeout: float) -> bool:
+        """
+        Block until an edge event arrives on the pin or the timeout expires.
+
+        :param timeout: The maximum time to wait in seconds.
+        :return: True if an edge was detected, False on timeout.
+        """
+        if self.request.wait_edge_events(timedelta(seconds=timeout)):
+            self.request.read_edge_events()
+            return True
+        return False
+
+
 class RockGPIO:
     def __init__(self):
         self.lines = {}
+        self.pins = {}
 
     def _parse_pin(self, pin: str) -> tuple[int, int]:
         bank, sub_bank, index = int(pin[4]), pin[6], int(pin[7])
         line_number = int((ord(sub_bank) - ord('A')) * 8 + index)
         return bank, line_number
 
-    def setup(self, pin: str, direction: Direction, initial_value: Value = Value.INACTIVE, bias: Bias = Bias.AS_IS) -> None:
+    def setup(self, pin: str, direction: Direction, initial_value: Value = Value.INACTIVE, bias: Bias = Bias.AS_IS, edge: Edge = Edge.NONE) -> RockPin:
+        """
+        Request a line and resolve the pin once.
+
+        :param pin: The pin name, e.g. "GPIO1_C6".
+        :param direction: Direction.INPUT or Direction.OUTPUT.
+        :param initial_value: The level driven on an output right away.
+        :param bias: The pull-up/down of an input.
+        :param edge: The edges to report on an input, see wait_for_edge.
+        :return: A handle driving the pin without any lookup.
+        """
         chip_number, line_number = self._parse_pin(pin)
-        line_settings = gpiod.LineSettings(direction=direction, output_value=initial_value, bias=bias)
+        line_settings = gpiod.LineSettings(direction=direction, output_value=initial_value, bias=bias, edge_detection=edge)
         line_request = gpiod.request_lines(f'/dev/gpiochip{chip_number}', consumer='RockGPIO', config={line_number: line_settings})
         self.lines[pin] = line_request
+        self.pins[pin] = RockPin(pin, line_request, line_number)
+        return self.pins[pin]
 
     def output(self, pin: str, value: Value) -> None:
-        line_request = self.lines.get(pin)
-        if line_request:
-            _, line_number = self._parse_pin(pin)
-            line_request.set_value(line_number, value)
+        handle = self.pins.get(pin)
+        if handle:
+            handle.set(value)
 
     def input(self, pin: str) -> Value:
-        line_request = self.lines.get(pin)
-        if line_request:
-            _, line_number = self._parse_pin(pin)
-            return line_request.get_value(line_number)
+        handle = self.pins.get(pin)
+        if handle:
+            return handle.get()
+
+    def clear_edge_events(self, pin: str) -> None:
+        """Drop edge events queued on an input set up with edge detection."""
+        handle = self.pins.get(pin)
+        if handle:
+            handle.clear_edge_events()
+
+    def wait_for_edge(self, pin: str, timeout: float) -> bool:
+        """
+        Block until an edge event arrives on the pin or the timeout expires.
+
+        :param pin: The pin, set up with edge detection.
+        :param timeout: The maximum time to wait in seconds.
+        :return: True if an edge was detected, False on timeout.
+        """
+        handle = self.pins.get(pin)
+        if not handle:
+            return False
+        return handle.wait_for_edge(timeout)
 
     def cleanup(self) -> None:
         for pin, line_request in self.lines.items():
             line_request.close()
         self.lines.clear()
+        self.pins.clear()
@@ -0,0 +1,259 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Every LUT register (0x20 VCOM, 0x21 WW, 0x22 R/BW, 0x23 W/WB, 0x24 B/BB) takes
+# 6 groups of 7 bytes: the level select of phases A-D (2 bits each, phase A in
+# the high bits), the frame counts of phases A-D and two repeat counts. A
+# waveform table is the 5 registers followed by PLL, VGH/VGL, VSH, VSL, VSHR
+# and VCOM_DC, the layout EinkDSP used for its single 4-gray table.
+LUT_SIZE = 42
+LUT_COUNT = 5
+WAVEFORM_SIZE = LUT_SIZE * LUT_COUNT + 6
+
+# Level select values of one phase
+LEVEL_VCOM = 0b00   # no drive
+LEVEL_BLACK = 0b01  # VSH
+LEVEL_WHITE = 0b10  # VSL
+
+# Panel setting for every register waveform: LUT from registers, scan up, shift right
+PANEL_SETTING_REG = bytes([0xFF, 0x0D])
+
+LUT_4G: List[int] = [
+    0x01,	0x05,	0x20,	0x19,	0x0A,	0x01,	0x01,
+    0x05,	0x0A,	0x01,	0x0A,	0x01,	0x01,	0x01,
+    0x05,	0x09,	0x02,	0x03,	0x04,	0x01,	0x01,
+    0x01,	0x04,	0x04,	0x02,	0x00,	0x01,	0x01,
+    0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
+    0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
+    0x01,	0x05,	0x20,	0x19,	0x0A,	0x01,	0x01,
+    0x05,	0x4A,	0x01,	0x8A,	0x01,	0x01,	0x01,
+    0x05,	0x49,	0x02,	0x83,	0x84,	0x01,	0x01,
+    0x01,	0x84,	0x84,	0x82,	0x00,	0x01,	0x01,
+    0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
+    0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
+    0x01,	0x05,	0x20,	0x99,	0x8A,	0x01,	0x01,
+    0x05,	0x4A,	0x01,	0x8A,	0x01,	0x01,	0x01,
+    0x05,	0x49,	0x82,	0x03,	0x04,	0x01,	0x01,
+    0x01,	0x04,	0x04,	0x02,	0x00,	0x01,	0x01,
+    0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
+    0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
+    0x01,	0x85,	0x20,	0x99,	0x0A,	0x01,	0x01,
+    0x05,	0x4A,	0x01,	0x8A,	0x01,	0x01,	0x01,
+    0x05,	0x49,	0x02,	0x83,	0x04,	0x01,	0x01,
+    0x01,	0x04,	0x04,	0x02,	0x00,	0x01,	0x01,
+    0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
+    0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
+    0x01,	0x85,	0xA0,	0x99,	0x0A,	0x01,	0x01,
+    0x05,	0x4A,	0x01,	0x8A,	0x01,	0x01,	0x01,
+    0x05,	0x49,	0x02,	0x43,	0x04,	0x01,	0x01,
+    0x01,	0x04,	0x04,	0x42,	0x00,	0x01,	0x01,
+    0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
+    0x01,	0x00,	0x00,	0x00,	0x00,	0x01,	0x01,
+    0x09,	0x10,	0x3F,	0x3F,	0x00,	0x0B,
+]
+
+# PLL, VGH/VGL, VSH, VSL, VSHR, VCOM_DC of the 4-gray table, shared by the 1-bit waveforms
+_SETTINGS_4G = tuple(LUT_4G[LUT_SIZE * LUT_COUNT:])
+
+
+def lut_group(levels: Tuple[int, ...], frames: Tuple[int, ...], repeat: int = 1) -> List[int]:
+    """
+    Encode one 7-byte LUT group.
+
+    :param levels: Level select of up to four phases, LEVEL_* values.
+    :param frames: Frame count of each phase, same length as levels.
+    :param repeat: How many times the group is repeated.
+    :return: The group bytes.
+    """
+    select = 0
+    for i, level in enumerate(levels):
+        select |= level << (6 - 2 * i)
+    frames = list(frames) + [0] * (4 - len(frames))
+    return [select, *frames, repeat, repeat]
+
+
+def build_lut(*groups: List[int]) -> List[int]:
+    """ Concatenate LUT groups and pad the register to 6 groups with empty ones """
+    lut = [byte for group in groups for byte in group]
+    return lut + [0x00] * (LUT_SIZE - len(lut))
+
+
+@dataclass(frozen=True)
+class Waveform:
+    """
+    A waveform uploaded to the LUT registers.
+
+    name: Registry key, also the refresh kind reported by the simulated panel.
+    table: The 5 LUT registers and 6 setting bytes, see WAVEFORM_SIZE.
+    border: CDI setting (0x50), selects the border level and data interval.
+    gray: Decode the old/new planes as a 2-bit pixel (4-gray) instead of a
+          previous/next 1-bit frame pair.
+    """
+    name: str
+    table: bytes
+    border: int = 0x57
+    gray: bool = False
+
+    def __post_init__(self) -> None:
+        if len(self.table) != WAVEFORM_SIZE:
+            raise ValueError(f"Waveform {self.name!r} needs {WAVEFORM_SIZE} table bytes, got {len(self.table)}")
+
+    @property
+    def luts(self) -> bytes:
+        return self.table[:LUT_SIZE * LUT_COUNT]
+
+    def lut_program(self) -> List[Tuple[int, bytes]]:
+        """
+        Compile the five LUT register writes (VCOM, WW, R, W, B).
+
+        :return: The register writes.
+        """
+        return [(0x20 + i, self.table[i * LUT_SIZE:(i + 1) * LUT_SIZE]) for i in range(LUT_COUNT)]
+
+    def transition_program(self, swapped: bool = False) -> List[Tuple[int, bytes]]:
+        """
+        Compile the R and W LUT writes, see swap_transitions.
+
+        :param swapped: Write each of the two LUTs to the other register.
+        :return: The register writes.
+        """
+        luts = swap_transitions(self.luts) if swapped else self.luts
+        return [(0x20 + i, luts[i * LUT_SIZE:(i + 1) * LUT_SIZE]) for i in (2, 3)]
+
+    def switch_program(self) -> List[Tuple[int, bytes]]:
+        """
+        Compile the writes that swap this waveform in on a panel already set up
+        for register LUTs: source/gate voltages, frame rate, border, VCOM level
+        and the LUTs.
+
+        :return: The register writes.
+        """
+        return [
+            # Power Setting: internal VSH/VSL/VGH/VGL, VGH/VGL, VSH, VSL, VSHR
+            (0x01, bytes([0x03, *self.table[211:215]])),
+            # PLL Control - Frame Rate
+            (0x30, bytes([self.table[210]])),
+            # CDI Setting
+            (0x50, bytes([self.border])),
+            # VCOM_DC Setting
+            (0x82, bytes([self.table[215]])),
+            *self.lut_program(),
+        ]
+
+    def init_program(self) -> List[Tuple[int, bytes]]:
+        """
+        Compile the init sequence sent between reset and power on, LUT upload included.
+
+        :return: The register writes.
+        """
+        return [
+            # Panel Setting, LUT from MCU
+            (0x00, PANEL_SETTING_REG),
+            # Power Setting: internal VSH/VSL/VGH/VGL, VGH/VGL, VSH, VSL, VSHR
+            (0x01, bytes([0x03, *self.table[211:215]])),
+            # Booster Soft Start
+            (0x06, bytes([0xD7, 0xD7, 0x27])),
+            # PLL Control - Frame Rate
+            (0x30, bytes([self.table[210]])),
+            # CDI Setting
+            (0x50, bytes([self.border])),
+            # TCON Setting
+            (0x60, bytes([0x22])),
+            # Resolution Setting: HRES 240, VRES 416
+            (0x61, bytes([0xF0, 0x01, 0xA0])),
+            (0x65, bytes([0x00])),
+            # VCOM_DC Setting
+            (0x82, bytes([self.table[215]])),
+            # Power Saving Register: VCOM_W[3:0], SD_W[3:0]
+            (0xE3, bytes([0x88])),
+            # LUT Setting
+            *self.lut_program(),
+        ]
+
+
+def swap_transitions(luts: bytes) -> bytes:
+    """
+    Exchange the R (black to white) and W (white to black) LUTs.
+
+    A 1-bit waveform picks the LUT of a pixel from its old (0x10) and new (0x13)
+    plane bits. With the frame on the panel in the new plane and the next frame
+    in the old plane, the swapped waveform drives every pixel like the original
+    one does with the planes the usual way round.
+
+    :param luts: The contents of registers 0x20 to 0x24, concatenated.
+    :return: The same registers with 0x22 and 0x23 exchanged.
+    """
+    return luts[:2 * LUT_SIZE] + luts[3 * LUT_SIZE:4 * LUT_SIZE] + luts[2 * LUT_SIZE:3 * LUT_SIZE] + luts[4 * LUT_SIZE:]
+
+
+def _bw_waveform(name: str, levels_to_white: Tuple[int, ...], levels_to_black: Tuple[int, ...],
+                 frames: Tuple[int, ...]) -> Waveform:
+    """
+    Build a 1-bit waveform driving only the pixels that change.
+
+    WW and BB keep the same phase timing without driving, so every pixel sees
+    the same number of frames.
+    """
+    idle = (LEVEL_VCOM,) * len(frames)
+    table = (build_lut(lut_group(idle, frames))                 # VCOM
+             + build_lut(lut_group(idle, frames))               # WW: white stays white
+             + build_lut(lut_group(levels_to_white, frames))    # R: black to white
+             + build_lut(lut_group(levels_to_black, frames))    # W: white to black
+             + build_lut(lut_group(idle, frames))               # B: black stays black
+             + list(_SETTINGS_4G))
+    # Floating border like the OTP partial mode, it is not redrawn between frames
+    return Waveform(name, bytes(table), border=0xD7)
+
+
+_WAVEFORMS: Dict[str, Waveform] = {}
+
+
+def register_waveform(waveform: Waveform) -> None:
+    """
+    Make a waveform available to EinkDSP.epd_init_waveform by name.
+
+    :param waveform: The waveform, replacing any registered under the same name.
+    """
+    _WAVEFORMS[waveform.name] = waveform
+
+
+def get_waveform(name: str) -> Waveform:
+    """
+    Look up a registered waveform.
+
+    :param name: The waveform name, e.g. '4g', 'partial_fast' or 'a2'.
+    :return: The waveform.
+    :raises ValueError: If no waveform is registered under that name.
+    """
+    try:
+        return _WAVEFORMS[name]
+    except KeyError:
+        raise ValueError(f"Unknown waveform: {name}, expected one of {sorted(_WAVEFORMS)}") from None
+
+
+def list_waveforms() -> List[str]:
+    return sorted(_WAVEFORMS)
+
+
+def find_waveform(luts: bytes) -> Optional[Waveform]:
+    """
+    Find the registered waveform whose LUT registers hold these bytes.
+
+    :param luts: The contents of registers 0x20 to 0x24, concatenated.
+    :return: The waveform, None if the LUTs are not a registered waveform.
+    """
+    for waveform in _WAVEFORMS.values():
+        if waveform.luts == luts:
+            return waveform
+    return None
+
+
+# Full quality 4-gray, frames are 2-bit
+register_waveform(Waveform('4g', bytes(LUT_4G), border=0x57, gray=True))
+# The 1-bit register waveforms below are opt-in only, their polarity and frame
+# counts have not been validated on a panel yet
+# Partial 1-bit: short kick away from the target, then drive to it
+register_waveform(_bw_waveform('partial_fast',
+                               (LEVEL_BLACK, LEVEL_WHITE), (LEVEL_WHITE, LEVEL_BLACK), (2, 12)))
+# A2 style: a single drive phase, fastest but ghosts, for animations and previews
+register_waveform(_bw_waveform('a2', (LEVEL_WHITE,), (LEVEL_BLACK,), (8,)))
@@ -1,6 +1,6 @@
 import os
 import logging
-from typing import Type
+from typing import Optional, Type, Union
 from PIL import Image
 
 logging.basicConfig(level=logging.INFO,
@@ -63,21 +63,37 @@ class Application:
         """
         self.current_page = NewPage(self, **kwargs)
 
-    def update_screen(self, image: Image.Image, format: str = '1bit', dithering: bool = True) -> None:
+    def update_screen(self, image: Image.Image, format: str = '1bit', dithering: Union[bool, str] = True, blocking: bool = True,
+                      waveform: Optional[str] = None) -> None:
         """
         Update the e-ink screen with the given image.
 
         :param image: The image to display.
-        :param format: The format of the image ('1bit' or '2bit').
-        :param dithering: Whether to apply dithering (only for '1bit' format).
+        :param format: The format of the image ('1bit', '2bit', or 'auto' to use the
+                       4-gray pipeline only for images with midtone content).
+        :param dithering: The dithering engine, e.g. 'blue_noise' or 'bayer' for fast
+                          frames, True for Floyd-Steinberg or False for none, see
+                          Eink.update_screen_1bit.
+        :param blocking: Wait for the panel refresh to finish (only for '1bit' format).
+        :param waveform: Registered waveform to refresh with (only for '1bit' format),
+                         None for the default partial refresh.
+
+        Inside batch_updates() only the last frame of the block is refreshed, see
+        Eink.update_screen.
         """
         logging.info('Updating screen')
-        if format == '1bit':
-            self.screen.update_screen_1bit(image, dithering=dithering)
-        elif format == '2bit':
-            self.screen.update_screen_2bit(image)
-        else:
-            raise ValueError(f"Unsupported format: {format}")
+        self.screen.update_screen(image, format=format, dithering=dithering, blocking=blocking,
+                                  waveform=waveform)
+
+    def batch_updates(self):
+        """
+        Context manager collapsing the screen updates made inside it into one refresh.
+
+            with self.app.batch_updates():
+                self.render_page(background)
+                self.render_page(background_with_dialog)
+        """
+        return self.screen.batch_updates()
 
     def press_callback(self, key: str) -> None:
         """
@@ -59,7 +59,8 @@ class Cam:
             time.sleep(0.25)  # Adjust for frame rate
             self.captured_image = self.camera.switch_mode_and_capture_image(
                 self.capture_config)
-            self.eink.update_screen_1bit(fast_image(self.captured_image))
+            self.eink.update_screen_1bit(fast_image(self.captured_image), blocking=False, stream=True,
+                                         dithering='blue_noise')
 
     def capture(self) -> Optional[Image.Image]:
         """Capture an image, stop the camera, and save the image.
@@ -2,79 +2,121 @@ from ast import List
 import os
 import time
 import logging
-from typing import Optional
+from typing import Iterator, Optional, Union
 import numpy as np
 import bisect
-from numba import jit
 import asyncio
+import threading
+import hashlib
+import weakref
+import dataclasses
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
 from functools import cache
 
-from PIL import Image
-from distiller.drivers.eink_dsp import EinkDSP
+from PIL import Image, ImageFilter
+from distiller.drivers.eink_dsp import EinkDSP, TraceEvent, UpdateTiming
+from distiller.drivers.waveforms import get_waveform
 from distiller.constants import EINK_WIDTH, EINK_HEIGHT
 from distiller.utils.commons import ThreadWorker
+from distiller.utils.dither import (FloydSteinbergPacker, dither, dither_engine_name, dither_rows,
+                                    floydSteinbergDithering_numba, warm_up)
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
 
-@jit(nopython=True, cache=True)
-def dump_1bit(pixels: np.ndarray) -> list[int]:
+# Rows converted and sent at a time by the streaming updates, 416 rows are 13 bands
+STREAM_BAND_ROWS = 32
+
+
+def dump_1bit(pixels: np.ndarray) -> bytes:
     """
     Convert an image to 1-bit representation.
 
+    Pixels above 128 are white, the two upper levels of the 4-level
+    quantization the dithering works with.
+
     :param pixels: The input pixel array.
-    :return: A list of integers representing the 1-bit image.
+    :return: The packed 1-bit image in row order, 8 pixels per byte.
     """
-    # Flatten the array for processing
-    # Ensure pixels are in valid range after dithering
-    pixels = np.clip(pixels, 0, 255)
-    pixels_quantized = np.digitize(pixels, bins=[64, 128, 192], right=True)
+    return np.packbits(np.ravel(pixels) > 128).tobytes()
 
-    # Calculate the needed size for the result
-    result_size = (pixels.size + 7) // 8
-    int_pixels = np.zeros(result_size, dtype=np.uint8)
 
-    index = 0
-    for i in range(pixels_quantized.size):
-        bit = 1 if pixels_quantized.flat[i] in [2, 3] else 0
-        if i % 8 == 0 and i > 0:
-            index += 1
-        int_pixels[index] |= bit << (7 - (i % 8))
-    return [int(x) for x in int_pixels]
+def dump_1bit_with_dithering(pixels: np.ndarray) -> bytes:
+    """
+    Convert an image to 1-bit representation with dithering.
+
+    :param pixels: The input float32 pixel array, dithered in place.
+    :return: The packed 1-bit image with dithering.
+    """
+    return dump_1bit(dither(pixels, 'floyd_steinberg'))
 
 
-@jit(nopython=True, cache=True)
-def dump_1bit_with_dithering(pixels: np.ndarray) -> list[int]:
+def convert_1bit_bands(pixels: np.ndarray, dithering: Union[bool, str] = True,
+                       band_rows: int = STREAM_BAND_ROWS) -> Iterator[bytes]:
     """
-    Convert an image to 1-bit representation with dithering.
+    Dither and pack an image into 1-bit bands, one band at a time.
 
-    :param pixels: The input pixel array.
-    :return: A list of integers representing the 1-bit image with dithering.
+    :param pixels: The input pixel array, float32 unless dithering is off. Dithered in place.
+    :param dithering: The dithering engine, see distiller.utils.dither.dither.
+    :param band_rows: Rows per band.
+    :return: An iterator over the packed bands, 8 pixels per byte.
     """
-    pixels = floydSteinbergDithering_numba(pixels)
-    return dump_1bit(pixels)
+    for start in range(0, pixels.shape[0], band_rows):
+        stop = start + band_rows
+        dither_rows(pixels, start, stop, dithering, levels=2)
+        yield dump_1bit(pixels[start:stop])
 
 
-@jit(nopython=True, cache=True)
-def floydSteinbergDithering_numba(pixels: np.ndarray) -> np.ndarray:
+def convert_2bit_bands(pixels: np.ndarray, dithering: Union[bool, str] = True,
+                       band_rows: int = STREAM_BAND_ROWS) -> Iterator[bytes]:
     """
-    Apply Floyd-Steinberg dithering to an image.
+    Dither and pack an image into 2-bit bands, one band at a time.
 
-    :param pixels: The input pixel array.
-    :return: The dithered pixel array.
+    :param pixels: The input float32 pixel array, dithered in place.
+    :param dithering: The dithering engine, see distiller.utils.dither.dither.
+    :param band_rows: Rows per band.
+    :return: An iterator over the packed bands, 4 pixels per byte.
     """
-    for y in range(pixels.shape[0] - 1):
-        for x in range(1, pixels.shape[1] - 1):
-            old_pixel = pixels[y, x]
-            new_pixel = np.round(old_pixel / 85) * 85
-            pixels[y, x] = new_pixel
-            quant_error = old_pixel - new_pixel
-            pixels[y, x + 1] += quant_error * 7 / 16
-            pixels[y + 1, x - 1] += quant_error * 3 / 16
-            pixels[y + 1, x] += quant_error * 5 / 16
-            pixels[y + 1, x + 1] += quant_error * 1 / 16
-    return pixels
+    for start in range(0, pixels.shape[0], band_rows):
+        stop = start + band_rows
+        dither_rows(pixels, start, stop, dithering, levels=4)
+        yield pack_2bit(pixels[start:stop])
+
+
+def pack_2bit(pixels: np.ndarray) -> bytes:
+    """
+    Quantize dithered pixels to 4 levels and pack them.
+
+    :param pixels: The dithered pixel array, a multiple of 4 pixels.
+    :return: The packed 2-bit image in row order, 4 pixels per byte, first pixel
+             in the high bits.
+    """
+    # Level 0-3: how many of the thresholds 64, 128 and 192 the pixel is above
+    pixels = np.ravel(pixels)
+    levels = (pixels > 64).astype(np.uint8)
+    levels += pixels > 128
+    levels += pixels > 192
+    quads = levels.reshape(-1, 4)
+    packed = quads[:, 0] << 6
+    packed |= quads[:, 1] << 4
+    packed |= quads[:, 2] << 2
+    packed |= quads[:, 3]
+    return packed.tobytes()
+
+
+def luminance(image: Image.Image) -> np.ndarray:
+    """ The 8-bit luminance of an image as an array, without converting 'L' images again """
+    return np.asarray(image if image.mode == 'L' else image.convert('L'))
+
+
+class _Packers(threading.local):
+    """ Fused Floyd-Steinberg packers of the current thread, by (bits, height, width) """
+
+    def __init__(self) -> None:
+        self.by_shape: dict = {}
 
 
 def paste_image(image: Image.Image, canvas_image: Image.Image, position: tuple[int, int] = None, border: bool = False, type: str = None) -> Image.Image:
@@ -88,14 +130,304 @@ def paste_image(image: Image.Image, canvas_image: Image.Image, position: tuple[i
     return canvas_ref
 
 
+@dataclass
+class EinkStats:
+    """Counters of the screen updates requested through Eink."""
+    updates: int = 0  # Frames sent to the panel
+    skipped: int = 0  # Frames identical to what the panel already shows
+    full_refreshes: int = 0  # 1-bit updates promoted to a full refresh by the scheduler
+    idle_refreshes: int = 0  # Full refreshes run by the scheduler while idle
+    coalesced: int = 0  # update_screen calls replaced by a later frame before reaching the panel
+    cache_hits: int = 0  # Frames taken from the FrameCache instead of being converted
+    cache_misses: int = 0  # Frames converted and added to the FrameCache
+
+
+# Number of set bits of every byte value
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint16)
+
+
+def pixel_churn(old_frame, new_frame) -> int:
+    """
+    Count the pixels that differ between two packed 1-bit frames.
+
+    :param old_frame: The frame on the panel, any bytes-like object or uint8 array.
+    :param new_frame: The frame about to be shown, same size.
+    :return: The number of pixels that flip.
+    """
+    diff = np.bitwise_xor(np.frombuffer(old_frame, dtype=np.uint8), np.frombuffer(new_frame, dtype=np.uint8))
+    return int(_POPCOUNT[diff].sum())
+
+
+def midtone_fraction(image: Image.Image, low: int = 32, high: int = 224, core: int = 3) -> float:
+    """
+    Measure how much of an image is covered by midtone areas (photos, gradients).
+
+    Only midtone pixels whose whole core x core neighbourhood is midtone count,
+    so the anti-aliased edges of text and icons do not.
+
+    :param image: The image to inspect.
+    :param low: Levels up to this value count as black.
+    :param high: Levels from this value on count as white.
+    :param core: Side of the neighbourhood, 1 to count every midtone pixel.
+    :return: The fraction of pixels in midtone areas.
+    """
+    mask = image.convert('L').point([255 if low < level < high else 0 for level in range(256)])
+    if core > 1:
+        mask = mask.filter(ImageFilter.MinFilter(core))
+    histogram = mask.histogram()
+    total = sum(histogram)
+    return histogram[255] / total if total else 0.0
+
+
+class RefreshScheduler:
+    """
+    Decide when a partial 1-bit update has to become a full (cleaning) refresh.
+
+    Partial refreshes leave ghosts that add up, so the scheduler counts them and
+    the pixels they flipped since the last full refresh, and asks for a full
+    refresh once either crosses its threshold. A panel left dirty is also
+    cleaned once the device has been idle for a while.
+    """
+
+    def __init__(self, max_partial_updates: int = 20, max_churn: float = 3.0,
+                 idle_timeout: Optional[float] = 30.0, pixels: int = EINK_WIDTH * EINK_HEIGHT) -> None:
+        """
+        :param max_partial_updates: Partial updates allowed between full refreshes.
+        :param max_churn: Flipped pixels allowed between full refreshes, in
+                          multiples of the panel area.
+        :param idle_timeout: Seconds without updates before a dirty panel gets
+                             a full refresh, None to never refresh while idle.
+        :param pixels: Number of pixels of the panel.
+        """
+        self.max_partial_updates = max_partial_updates
+        self.max_churn = max_churn
+        self.idle_timeout = idle_timeout
+        self.pixels = pixels
+        self.partial_updates = 0
+        self.churn = 0
+        # The panel content is unknown, e.g. another instance drew on it
+        self.full_requested = False
+
+    @property
+    def dirty(self) -> bool:
+        """Whether partial updates happened since the last full refresh."""
+        return self.partial_updates > 0
+
+    def due(self, churn: int) -> bool:
+        """
+        Tell whether the next update should be a full refresh.
+
+        :param churn: Pixels the next update flips, see pixel_churn.
+        :return: True if a partial update would cross a threshold.
+        """
+        return (self.full_requested
+                or self.partial_updates + 1 > self.max_partial_updates
+                or (self.churn + churn) > self.max_churn * self.pixels)
+
+    def record_partial(self, churn: int) -> None:
+        self.partial_updates += 1
+        self.churn += churn
+
+    def record_full(self) -> None:
+        self.partial_updates = 0
+        self.churn = 0
+        self.full_requested = False
+
+    def request_full(self) -> None:
+        """ Make the next update a full refresh, whatever the counters say """
+        self.full_requested = True
+
+
+def frame_fingerprint(format: str, buffer) -> tuple[str, bytes]:
+    """
+    Fingerprint a packed panel frame.
+
+    :param format: The frame format ('1bit' or '2bit').
+    :param buffer: The packed frame, any bytes-like object or uint8 array.
+    :return: A key that compares equal for byte-identical frames of the same format.
+    """
+    return format, hashlib.blake2b(memoryview(buffer), digest_size=16).digest()
+
+
+class FrameCache:
+    """
+    Bounded LRU cache of converted panel frames, keyed by image content.
+
+    Screens that come back, e.g. navigating back to a page or reflush(), go
+    straight to the panel without being dithered and packed again.
+    """
+
+    def __init__(self, max_frames: int = 16) -> None:
+        """
+        :param max_frames: Frames kept, the least recently used is dropped first.
+                           0 disables the cache.
+        """
+        self.max_frames = max_frames
+        self._frames: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(image: Image.Image, format: str, dithering: str) -> tuple:
+        """
+        Key of the frame an image converts to.
+
+        :param image: The image to display.
+        :param format: The frame format ('1bit' or '2bit').
+        :param dithering: The dithering engine name.
+        :return: A key that compares equal for images with the same pixels.
+        """
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16)
+        # Palette images store indices, the same indices show other pixels with another palette
+        palette = image.getpalette() if image.mode in ('P', 'PA') else None
+        if palette is not None:
+            digest.update(bytes(palette))
+        return image.mode, image.size, digest.digest(), format, dithering
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+            return frame
+
+    def put(self, key: tuple, frame) -> bytes:
+        """
+        Store a converted frame.
+
+        :param key: The key from FrameCache.key.
+        :param frame: The packed frame, any bytes-like object or uint8 array.
+        :return: The frame as stored, an immutable copy.
+        """
+        frame = bytes(frame)
+        with self._lock:
+            self._frames[key] = frame
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+        return frame
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+class PowerManager:
+    """
+    Idle policy for the panel controller.
+
+    After power_off_after seconds without updates the controller is powered off,
+    it keeps its registers and waveform so waking is a single power on. After
+    sleep_after seconds it goes to deep sleep, waking then takes a reset and the
+    init of the last mode. The frame on the panel (EinkDSP.oldData) survives both.
+    """
+
+    def __init__(self, power_off_after: Optional[float] = 5.0, sleep_after: Optional[float] = 300.0) -> None:
+        """
+        :param power_off_after: Idle seconds before powering off, None to stay powered.
+        :param sleep_after: Idle seconds before deep sleep, None to never sleep.
+        """
+        self.power_off_after = power_off_after
+        self.sleep_after = sleep_after
+        self.power_offs = 0
+        self.sleeps = 0
+        self.wakes = 0
+        self.last_wake_latency = 0.0
+        # Seconds spent bringing the controller back up, per wake
+        self.wake_latencies: deque = deque(maxlen=64)
+
+    def next_step(self, powered: bool, asleep: bool, idle: float) -> Optional[tuple[str, float]]:
+        """
+        Decide the next idle transition.
+
+        :param powered: Whether the controller is powered on.
+        :param asleep: Whether the controller is in deep sleep.
+        :param idle: Seconds since the last update.
+        :return: ('power_off' or 'sleep', seconds from now), None if nothing is due.
+        """
+        if asleep:
+            return None
+        if powered and self.power_off_after is not None and (
+                self.sleep_after is None or self.power_off_after < self.sleep_after):
+            return 'power_off', max(0.0, self.power_off_after - idle)
+        if self.sleep_after is not None:
+            return 'sleep', max(0.0, self.sleep_after - idle)
+        return None
+
+    def record_wake(self, latency: float) -> None:
+        self.wakes += 1
+        self.last_wake_latency = latency
+        self.wake_latencies.append(latency)
+
+
 class Eink:
-    def __init__(self) -> None:
-        """Initialize the Eink class."""
-        self.display = EinkDSP()
+    # Every instance not yet closed, see suspend_all
+    _live: "weakref.WeakSet[Eink]" = weakref.WeakSet()
+
+    def __init__(self, region_update: bool = False, backend=None,
+                 scheduler: Optional[RefreshScheduler] = None, power: Optional[PowerManager] = None,
+                 reuse_ram: bool = False, frame_cache: Optional[FrameCache] = None) -> None:
+        """
+        Initialize the Eink class.
+
+        :param region_update: Send and refresh only the changed window on 1-bit updates.
+                              Opt-in, the partial-window commands have not been
+                              validated on a panel yet.
+        :param backend: Optional hardware backend for EinkDSP, e.g. a
+                        distiller.drivers.eink_sim.SimulatedPanel for headless runs.
+        :param scheduler: Policy promoting partial 1-bit updates to full refreshes,
+                          a default RefreshScheduler if None.
+        :param power: Idle power policy for the controller, a default PowerManager if None.
+        :param frame_cache: Cache of converted frames, a default FrameCache if None.
+        :param reuse_ram: With a 1-bit register waveform, send only the new frame when
+                          the controller still holds the old one, see EinkDSP.
+        """
+        # Load the numba dithering kernels in the background, frames converted
+        # before they are ready use the pure Python kernels
+        warm_up()
+        self.display = EinkDSP(backend=backend, reuse_ram=reuse_ram)
+        self.region_update = region_update
         self.locked = False
         self.in_4g = True
         self.thread_worker: Optional[ThreadWorker] = None
         self.last_image_cache: Optional[Image.Image] = None
+        self.stats = EinkStats()
+        self._packers = _Packers()
+        # Phase timing of the last update_screen_1bit/2bit call, None before the first
+        self.last_timing: Optional[UpdateTiming] = None
+        # Fingerprint of the frame on the panel, None when unknown
+        self._shown_fingerprint: Optional[tuple[str, bytes]] = None
+        self.scheduler = scheduler or RefreshScheduler()
+        # 'auto' updates use the 4-gray pipeline above this fraction of the frame
+        # in midtone areas, see midtone_fraction
+        self.auto_midtone_fraction = 0.02
+        # Go from a 4-gray frame to 1-bit with a single partial refresh starting
+        # from the 1-bit approximation of the gray frame, instead of clearing first
+        self.seamless_transition = True
+        # Whether the controller holds an approximation of the 4-gray frame on the panel
+        self._gray_seeded = False
+        # Send the next 1-bit frame whole, the panel still shows the gray frame
+        self._full_frame_next = False
+        # Seconds update_screen waits for a newer frame before refreshing, 0 to refresh right away
+        self.coalesce_window = 0.0
+        # Serializes updates with the idle refresh and coalescing timers
+        self._lock = threading.RLock()
+        self._idle_timer: Optional[threading.Timer] = None
+        self.power = power or PowerManager()
+        self.frame_cache = frame_cache if frame_cache is not None else FrameCache()
+        self._power_timer: Optional[threading.Timer] = None
+        self._last_activity = time.monotonic()
+        self._coalesce_timer: Optional[threading.Timer] = None
+        self._batch_depth = 0
+        # Arguments of the update_screen call waiting to be flushed
+        self._deferred: Optional[tuple] = None
+        # The timers do nothing while another instance owns the panel or after close()
+        self._suspended = False
+        self._closed = False
+        Eink._live.add(self)
+        self._arm_power_timer()
 
     @cache
     def run_animation(self, thread_event, image_folder: str) -> None:
@@ -112,7 +444,7 @@ class Eink:
         while thread_event.is_set():
             for image in images:
                 frame = paste_image(image, self.last_image_cache)
-                self.update_screen_1bit(frame)
+                self.update_screen_1bit(frame, dithering='bayer', blocking=False)
                 time.sleep(0.1)  # Adjust time per frame as needed
 
     def start_animation(self, canvas_image: Image.Image, image_folder: str) -> None:
@@ -136,6 +468,8 @@ class Eink:
         """Transition the display to 1-bit mode."""
         self.display.epd_init_fast()
         self.display.pic_display_clear()
+        self._shown_fingerprint = None
+        self.scheduler.record_full()
         logging.info('transit to 2 grad')
 
     def clear_screen(self) -> None:
@@ -143,48 +477,568 @@ class Eink:
         logging.info('clear screen')
         image = Image.new("L", (EINK_WIDTH, EINK_HEIGHT), "white")
         hex_pixels = dump_1bit(self.preprocess_1bit(image, np.uint8))
-        self.display.epd_init_part()
-        self.display.pic_display(hex_pixels)
-        self.display.pic_display_clear()
+        with self._lock:
+            self._cancel_idle_refresh()
+            with self._waking():
+                self.display.epd_init_part()
+            self.display.pic_display(hex_pixels)
+            self.display.pic_display_clear()
+            self._shown_fingerprint = None
+            self.scheduler.record_full()
+            self._arm_power_timer()
+
+    def choose_format(self, image: Image.Image) -> str:
+        """
+        Pick the cheapest format that renders an image well.
+
+        :param image: The image to display.
+        :return: '2bit' if the image has meaningful midtone content (photos,
+                 gradients), '1bit' for black and white UI.
+        """
+        return '2bit' if midtone_fraction(image) > self.auto_midtone_fraction else '1bit'
+
+    def update_screen(self, image: Image.Image, format: str = 'auto', dithering: Union[bool, str] = True,
+                      blocking: bool = True, waveform: Optional[str] = None) -> Optional[str]:
+        """
+        Update the e-ink screen in the given format.
+
+        Inside batch_updates(), or when coalesce_window is set, the frame is only
+        recorded and a later call replaces it, so a burst of updates building
+        one screen costs a single refresh of its final frame.
+
+        :param image: The image to display.
+        :param format: '1bit', '2bit', or 'auto' to pick one with choose_format.
+        :param dithering: The dithering engine ('threshold', 'bayer', 'blue_noise',
+                          'atkinson' or 'floyd_steinberg'), True for Floyd-Steinberg
+                          or False for none.
+        :param blocking: Wait for the panel refresh to finish (only for '1bit' format).
+        :param waveform: Registered waveform to refresh with (only for '1bit' format).
+        :return: The format used, None if the update was deferred.
+        """
+        if format not in ('auto', '1bit', '2bit'):
+            raise ValueError(f"Unsupported format: {format}")
+        dither_engine_name(dithering)
+        with self._lock:
+            if self._batch_depth or self.coalesce_window > 0:
+                if self._deferred is not None:
+                    self.stats.coalesced += 1
+                # Keep a copy, the caller may go on drawing into the image (e.g. the GUI canvas)
+                self._deferred = (image.copy(), format, dithering, blocking, waveform)
+                if not self._batch_depth:
+                    self._arm_coalesce_timer()
+                return None
+        return self._update_screen_now(image, format, dithering, blocking, waveform)
+
+    def _arm_coalesce_timer(self) -> None:
+        # The window starts with the first frame of a burst, so later
+        # frames never delay the refresh by more than coalesce_window
+        if self._coalesce_timer is not None or not self._owns_panel:
+            return
+        self._coalesce_timer = threading.Timer(self.coalesce_window, self._coalesce_expired)
+        self._coalesce_timer.daemon = True
+        self._coalesce_timer.start()
+
+    def _update_screen_now(self, image: Image.Image, format: str, dithering: Union[bool, str],
+                           blocking: bool, waveform: Optional[str]) -> str:
+        if format == 'auto':
+            format = self.choose_format(image)
+        if format == '1bit':
+            self.update_screen_1bit(image, dithering=dithering, blocking=blocking, waveform=waveform)
+        else:
+            self.update_screen_2bit(image, dithering=dithering)
+        return format
+
+    @contextmanager
+    def batch_updates(self):
+        """
+        Collapse every update_screen call inside the block into one refresh of the
+        last frame, sent when the outermost block exits.
 
-    def update_screen_1bit(self, image: Image.Image, dithering: bool = True) -> None:
+            with eink.batch_updates():
+                eink.update_screen(background)
+                eink.update_screen(background_with_dialog)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self.flush_updates()
+
+    def flush_updates(self) -> Optional[str]:
+        """
+        Send the deferred update_screen frame now, if there is one.
+
+        :return: The format used, None if nothing was pending.
+        """
+        with self._lock:
+            if self._coalesce_timer is not None:
+                self._coalesce_timer.cancel()
+                self._coalesce_timer = None
+            deferred, self._deferred = self._deferred, None
+            if deferred is None:
+                return None
+            return self._update_screen_now(*deferred)
+
+    def _coalesce_expired(self) -> None:
+        with self._lock:
+            if self._coalesce_timer is not threading.current_thread():
+                return  # Flushed while this timer was waiting for the lock
+            self._coalesce_timer = None
+            if self._batch_depth or not self._owns_panel:
+                return  # The batch flushes on exit
+            try:
+                self.flush_updates()
+            except Exception as e:
+                logging.error(f"Coalesced update failed: {e}")
+
+    def update_screen_1bit(self, image: Image.Image, dithering: Union[bool, str] = True, blocking: bool = True,
+                           force: bool = False, waveform: Optional[str] = None, stream: bool = False) -> None:
         """
         Update the e-ink screen with a 1-bit image.
 
         :param image: The image to display.
-        :param dithering: Whether to apply dithering.
+        :param dithering: The dithering engine, see distiller.utils.dither.dither:
+                          'floyd_steinberg' (or True), 'atkinson', or the ordered
+                          'bayer' and 'blue_noise', which are much faster and keep
+                          the pattern of unchanged areas stable between frames.
+                          'threshold' (or False) does not dither.
+        :param blocking: Wait for the panel refresh to finish. When False, return once
+                         the frame is transferred so the next frame can be prepared
+                         while the panel refreshes, the next update waits for it.
+        :param force: Refresh even if the panel already shows this frame.
+        :param waveform: Registered waveform to refresh with (see
+                         distiller.drivers.waveforms). None uses the OTP partial
+                         refresh. 'a2' and 'partial_fast' are opt-in, they have not
+                         been validated on a panel yet.
+        :param stream: Convert the frame band by band and send every band as soon as
+                       it is ready, overlapping the conversion with the transfer. For
+                       frames that change most of the panel, e.g. a camera preview:
+                       the update is always full-frame and never skipped.
+        :raises ValueError: If the waveform is unknown or a 4-gray waveform.
         """
         logging.info('running update_screen_1bit')
-        self._status_check()
-        pixels = self.preprocess_1bit(
-            image) if dithering else self.preprocess_1bit(image, np.uint8)
-        hex_pixels = dump_1bit_with_dithering(
-            pixels) if dithering else dump_1bit(pixels)
-        self.display.epd_init_part()
-        self.display.pic_display(hex_pixels)
-        self.last_image_cache = image
+        dithering = dither_engine_name(dithering)
+        if waveform is not None and get_waveform(waveform).gray:
+            raise ValueError(f"Waveform {waveform!r} is for 2-bit frames, use update_screen_2bit")
+        if stream:
+            with self._lock:
+                if not self.scheduler.due(0):
+                    self._stream_screen_1bit(image, dithering, blocking, waveform)
+                    return
+            # A full refresh is due, it needs the whole frame first
+        start = time.perf_counter()
+        hex_pixels = self._cached_frame(image, '1bit', dithering)
+        preprocess = time.perf_counter() - start
+        with self._lock:
+            self.display.take_timing()  # Drop what ran between updates, e.g. an idle refresh
+            try:
+                self.last_image_cache = image
+                self._status_check()
+                if self._skip_frame('1bit', hex_pixels, force):
+                    return
+                churn = pixel_churn(self.display.oldData, hex_pixels)
+                if self.scheduler.due(churn):
+                    logging.info('ghosting threshold reached, full refresh')
+                    self.stats.full_refreshes += 1
+                    self._full_refresh(hex_pixels, blocking)
+                    self._record_frame('1bit', hex_pixels)
+                    return
+                if self._full_frame_next:
+                    # Gray pixels linger where the approximation matched the new frame,
+                    # let the scheduler clean them up sooner
+                    churn += self.scheduler.pixels
+                with self._waking():
+                    if waveform is None:
+                        self.display.epd_init_part()
+                    else:
+                        self.display.epd_init_waveform(waveform)
+                self.display.pic_display(hex_pixels, region=self.region_update and not self._full_frame_next,
+                                         blocking=blocking)
+                self._record_frame('1bit', hex_pixels)
+                self._full_frame_next = False
+                self.scheduler.record_partial(churn)
+                self._arm_idle_refresh()
+            finally:
+                self._finish_timing(preprocess)
+                self._arm_power_timer()
+
+    def _stream_screen_1bit(self, image: Image.Image, dithering: str, blocking: bool,
+                            waveform: Optional[str]) -> None:
+        """ update_screen_1bit converting the frame while it is sent, see EinkDSP.pic_display_stream """
+        self.display.take_timing()
+        try:
+            self.last_image_cache = image
+            self._status_check()
+            self._shown_fingerprint = None  # Unknown until the frame is sent
+            with self._waking():
+                if waveform is None:
+                    self.display.epd_init_part()
+                else:
+                    self.display.epd_init_waveform(waveform)
+            old_data = self.display.oldData
+            self.display.pic_display_stream(self._stream_1bit(image, dithering), blocking=blocking)
+            hex_pixels = self.display.oldData
+            self._record_frame('1bit', hex_pixels)
+            churn = pixel_churn(old_data, hex_pixels)
+            if self._full_frame_next:
+                churn += self.scheduler.pixels
+                self._full_frame_next = False
+            self.scheduler.record_partial(churn)
+            self._arm_idle_refresh()
+        finally:
+            self._finish_timing(0.0)
+            self._arm_power_timer()
+
+    def _packer(self, bits: int, luma: np.ndarray) -> FloydSteinbergPacker:
+        """ The fused Floyd-Steinberg packer of this thread for a frame format and size """
+        key = (bits, *luma.shape)
+        packer = self._packers.by_shape.get(key)
+        if packer is None:
+            packer = self._packers.by_shape[key] = FloydSteinbergPacker(luma.shape[1], luma.shape[0], bits)
+        return packer
+
+    def _cached_frame(self, image: Image.Image, format: str, dithering: str):
+        """
+        Convert an image into a packed frame, or take it from the frame cache.
+
+        :param image: The image to display.
+        :param format: The frame format ('1bit' or '2bit').
+        :param dithering: The dithering engine name.
+        :return: The packed frame as bytes, or as the reused buffer of _convert_1bit
+                 and _convert_2bit when the cache is disabled.
+        """
+        convert = self._convert_1bit if format == '1bit' else self._convert_2bit
+        if not self.frame_cache.max_frames:
+            return convert(image, dithering)
+        key = self.frame_cache.key(image, format, dithering)
+        frame = self.frame_cache.get(key)
+        if frame is not None:
+            self.stats.cache_hits += 1
+            return frame
+        self.stats.cache_misses += 1
+        return self.frame_cache.put(key, convert(image, dithering))
+
+    def _convert_1bit(self, image: Image.Image, dithering: str):
+        """
+        Convert an image into a packed 1-bit frame, bottom row first.
+
+        Floyd-Steinberg runs fused with the packing into a buffer reused by the
+        next conversion on this thread, other engines return new bytes.
+        """
+        if dithering == 'floyd_steinberg':
+            luma = luminance(image)
+            return self._packer(1, luma).convert(luma, flip=True)
+        pixels = self.preprocess_1bit(image, np.uint8 if dithering == 'threshold' else np.float32)
+        return dump_1bit(dither(pixels, dithering))
+
+    def _stream_1bit(self, image: Image.Image, dithering: str) -> Iterator[bytes]:
+        """ Convert a frame into 1-bit bands in the row order of the loaded waveform """
+        if dithering == 'floyd_steinberg':
+            luma = luminance(image)
+            yield from self._packer(1, luma).bands(luma, STREAM_BAND_ROWS, flip=not self.display.rows_reversed)
+            return
+        image = image.convert('L')
+        if not self.display.rows_reversed:
+            image = image.transpose(Image.FLIP_TOP_BOTTOM)
+        pixels = np.array(image, dtype=np.uint8 if dithering == 'threshold' else np.float32)
+        yield from convert_1bit_bands(pixels, dithering)
+
+    def _full_refresh(self, hex_pixels, blocking: bool = True) -> None:
+        """ Show a 1-bit frame with the full-panel fast waveform, clearing accumulated ghosts """
+        self._cancel_idle_refresh()
+        self._full_frame_next = False
+        with self._waking():
+            self.display.epd_init_fast()
+        self.display.pic_display(hex_pixels, blocking=blocking)
+        self.scheduler.record_full()
+
+    def _arm_idle_refresh(self) -> None:
+        """ Restart the countdown to the full refresh of a dirty panel """
+        self._cancel_idle_refresh()
+        if self.scheduler.idle_timeout is None or not self._owns_panel:
+            return
+        self._idle_timer = threading.Timer(self.scheduler.idle_timeout, self._idle_refresh)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_refresh(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
 
-    def update_screen_2bit(self, image: Image.Image) -> None:
+    def _idle_refresh(self) -> None:
+        with self._lock:
+            if self._idle_timer is not threading.current_thread():
+                return  # Cancelled or rearmed while this timer was waiting for the lock
+            self._idle_timer = None
+            if not self.scheduler.dirty or self.in_4g or not self._owns_panel:
+                return
+            logging.info('idle, full refresh to clear ghosting')
+            self.stats.idle_refreshes += 1
+            try:
+                self._full_refresh(self.display.oldData)
+            except Exception as e:
+                logging.error(f"Idle refresh failed: {e}")
+            self._schedule_power_step()
+
+    def wake(self) -> None:
+        """
+        Bring the controller up in its last mode ahead of an update, e.g. on a
+        button press, so the update itself does not pay the wake latency.
+        """
+        with self._lock:
+            with self._waking():
+                self.display.wake()
+            self._arm_power_timer()
+
+    @contextmanager
+    def _waking(self):
+        """ Record the wake latency if the block brings a powered down controller back up """
+        was_down = not self.display.powered
+        start = time.perf_counter()
+        yield
+        if was_down and self.display.powered:
+            latency = time.perf_counter() - start
+            self.power.record_wake(latency)
+            logging.info(f'panel woke up in {latency * 1000:.1f} ms')
+
+    def _arm_power_timer(self) -> None:
+        """ Note panel activity and restart the idle power countdown """
+        self._last_activity = time.monotonic()
+        self._schedule_power_step()
+
+    def _schedule_power_step(self) -> None:
+        if self._power_timer is not None:
+            self._power_timer.cancel()
+            self._power_timer = None
+        if not self._owns_panel:
+            return
+        step = self.power.next_step(self.display.powered, self.display.asleep,
+                                    time.monotonic() - self._last_activity)
+        if step is None:
+            return
+        self._power_timer = threading.Timer(step[1], self._power_step)
+        self._power_timer.daemon = True
+        self._power_timer.start()
+
+    def _power_step(self) -> None:
+        with self._lock:
+            if self._power_timer is not threading.current_thread():
+                return  # Rearmed by an update while this timer was waiting for the lock
+            self._power_timer = None
+            if not self._owns_panel:
+                return
+            step = self.power.next_step(self.display.powered, self.display.asleep,
+                                        time.monotonic() - self._last_activity)
+            if step is None:
+                return
+            action, delay = step
+            if delay <= 0:
+                try:
+                    if action == 'power_off':
+                        logging.info('panel idle, power off')
+                        self.display.power_off()
+                        self.power.power_offs += 1
+                    else:
+                        logging.info('panel idle, deep sleep')
+                        self.display.epd_sleep()
+                        self.power.sleeps += 1
+                except Exception as e:
+                    logging.error(f"Idle power step failed: {e}")
+                    return
+            self._schedule_power_step()
+
+    def update_screen_2bit(self, image: Image.Image, force: bool = False, stream: bool = False,
+                           dithering: Union[bool, str] = True) -> None:
         """
         Update the e-ink screen with a 2-bit image.
 
         :param image: The image to display.
+        :param force: Refresh even if the panel already shows this frame.
+        :param stream: Convert the frame band by band while its old plane is sent,
+                       see EinkDSP.pic_display_4g_stream. The update is never skipped.
+        :param dithering: The dithering engine, see update_screen_1bit.
         """
         logging.info('running update_screen_2bit')
-        self.in_4g = True
-        hex_pixels = self.preprocess_2bit(image)
-        self.display.epd_w21_init_4g()
-        self.display.pic_display_4g(hex_pixels)
-        self.display.epd_sleep()
-        self.last_image_cache = image
+        dithering = dither_engine_name(dithering)
+        start = time.perf_counter()
+        hex_pixels = None if stream else self._cached_frame(image, '2bit', dithering)
+        preprocess = time.perf_counter() - start
+        with self._lock:
+            self.display.take_timing()
+            try:
+                self.last_image_cache = image
+                if not stream and self._skip_frame('2bit', hex_pixels, force):
+                    return
+                self._cancel_idle_refresh()
+                self.in_4g = True
+                with self._waking():
+                    self.display.epd_w21_init_4g()
+                if stream:
+                    self._shown_fingerprint = None  # Unknown until the frame is sent
+                    bands = []
+                    self.display.pic_display_4g_stream(self._stream_2bit(image, bands, dithering))
+                    hex_pixels = b''.join(bands)
+                else:
+                    self.display.pic_display_4g(hex_pixels)
+                self._record_frame('2bit', hex_pixels)
+                self._gray_seeded = True
+                self.scheduler.record_full()
+            finally:
+                self._finish_timing(preprocess)
+                self._arm_power_timer()
+
+    def _stream_2bit(self, image: Image.Image, bands: list, dithering: str) -> Iterator[bytes]:
+        """ Convert a frame into 2-bit bands, keeping every band in bands """
+        if dithering == 'floyd_steinberg':
+            luma = luminance(image)
+            converted = self._packer(2, luma).bands(luma, STREAM_BAND_ROWS)
+        else:
+            converted = convert_2bit_bands(np.array(image.convert('L'), dtype=np.float32), dithering)
+        for band in converted:
+            bands.append(band)
+            yield band
+
+    def _finish_timing(self, preprocess: float) -> None:
+        """ Collect the phase timing of the update that just ended into last_timing """
+        timing = self.display.take_timing()
+        # Streamed updates already counted their conversion as preprocess
+        timing.preprocess += preprocess
+        self.last_timing = timing
+        if self.display.trace is not None:
+            self.display.trace(TraceEvent(time.monotonic(), 'phase', 'preprocess', preprocess))
+
+    def _skip_frame(self, format: str, hex_pixels, force: bool) -> bool:
+        """
+        Tell whether the panel already shows the frame about to be sent.
+
+        When it does not, the panel content is unknown until _record_frame, so
+        a failed update is retried instead of skipped.
+
+        :param format: The frame format ('1bit' or '2bit').
+        :param hex_pixels: The packed frame.
+        :param force: Never skip, e.g. when the panel content is unknown.
+        :return: True if the hardware update can be skipped.
+        """
+        if not force and frame_fingerprint(format, hex_pixels) == self._shown_fingerprint:
+            self.stats.skipped += 1
+            logging.info(f'skip {format} update, frame already on the panel')
+            return True
+        self._shown_fingerprint = None
+        return False
+
+    def _record_frame(self, format: str, hex_pixels) -> None:
+        """ Record the frame an update just sent to the panel """
+        self.stats.updates += 1
+        self._shown_fingerprint = frame_fingerprint(format, hex_pixels)
+
+    def get_stats(self) -> EinkStats:
+        """
+        Get a snapshot of the update counters.
+
+        :return: A copy of the current EinkStats.
+        """
+        return dataclasses.replace(self.stats)
+
+    def wait_idle(self) -> None:
+        """Block until a refresh started with blocking=False has finished."""
+        self.display.wait_idle()
+
+    @property
+    def _owns_panel(self) -> bool:
+        return not (self._suspended or self._closed)
+
+    def _cancel_timers(self) -> None:
+        self._cancel_idle_refresh()
+        for timer in (self._power_timer, self._coalesce_timer):
+            if timer is not None:
+                timer.cancel()
+        self._power_timer = None
+        self._coalesce_timer = None
+
+    def suspend(self) -> bool:
+        """
+        Stop the idle refresh, power and coalescing timers while another Eink
+        instance drives the panel, e.g. the HijackEink shutdown dialog.
+
+        A deferred update_screen frame is kept and sent after resume().
+
+        :return: True if the instance was running, False if it was already
+                 suspended or closed.
+        """
+        with self._lock:
+            if not self._owns_panel:
+                return False
+            self._suspended = True
+            self._cancel_timers()
+            return True
+
+    def resume(self) -> None:
+        """
+        Take the panel back after suspend() and restart the timers.
+
+        The panel shows what the other instance drew, so the controller state and
+        the frame this instance last drew are forgotten: the next update resets
+        the controller, is never skipped and is a full refresh.
+        """
+        with self._lock:
+            if self._closed or not self._suspended:
+                return
+            self._suspended = False
+            self.display.invalidate_state()
+            self._shown_fingerprint = None
+            self._full_frame_next = True
+            self.scheduler.request_full()
+            if self._deferred is not None and not self._batch_depth:
+                self._arm_coalesce_timer()
+            self._arm_power_timer()
+
+    @classmethod
+    def suspend_all(cls) -> list:
+        """
+        Suspend every running instance, see suspend().
+
+        :return: The instances suspended by this call, to resume() later.
+        """
+        return [eink for eink in list(cls._live) if eink.suspend()]
+
+    def close(self) -> None:
+        """
+        Stop the timers and release the driver. The instance must not be used
+        afterwards, and never touches the panel again on its own.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._cancel_timers()
+            self._deferred = None
+            Eink._live.discard(self)
+            self.display.cleanup()
 
     def reflush(self) -> None:
-        self.update_screen_2bit(self.last_image_cache)
+        # The panel may have been driven by someone else (e.g. HijackEink), so neither
+        # the frame on it nor the controller mode can be trusted
+        self.resume()
+        self.display.invalidate_state()
+        self.update_screen_2bit(self.last_image_cache, force=True)
 
     def _status_check(self) -> None:
         """Check and update the display status."""
         if self.in_4g:
-            self.transit_to_1bit()
+            if self.seamless_transition and self._gray_seeded:
+                # EinkDSP kept the 1-bit approximation of the gray frame as oldData,
+                # the next update refreshes from it directly
+                logging.info('transit to 1bit from the 4-gray frame')
+                self._full_frame_next = True
+            else:
+                self.transit_to_1bit()
+            self._gray_seeded = False
             self.in_4g = False
 
     def preprocess_1bit(self, image: Image.Image, dtype=np.float32) -> np.ndarray:
@@ -197,24 +1051,20 @@ class Eink:
         """
         return np.array(image.transpose(Image.FLIP_TOP_BOTTOM).convert('L'), dtype=dtype)
 
-    def preprocess_2bit(self, image: Image.Image) -> list[int]:
+    def preprocess_2bit(self, image: Image.Image, dithering: Union[bool, str] = True) -> bytes:
         """
         Preprocess the image for 2-bit display.
 
         :param image: The image to preprocess.
-        :return: A list of integers representing the 2-bit image.
+        :param dithering: The dithering engine, see update_screen_1bit.
+        :return: The packed 2-bit image, 4 pixels per byte.
         """
-        pixels = np.array(image.convert('L'), dtype=np.float32)
-        pixels = floydSteinbergDithering_numba(pixels)
-        pixels = np.clip(pixels, 0, 255)
-        pixels_quantized = np.digitize(pixels, bins=[64, 128, 192], right=True)
-
-        pixel_map = {0: '00', 1: '01', 2: '10', 3: '11'}
-        pixels_string = np.vectorize(pixel_map.get)(pixels_quantized).flatten()
+        return bytes(self._cached_frame(image, '2bit', dither_engine_name(dithering)))
 
-        group_size = 4
-        grouped_pixels = [''.join(pixels_string[i:i+group_size])
-                          for i in range(0, len(pixels_string), group_size)]
-        int_pixels = [int(bits, 2) for bits in grouped_pixels]
-
-        return [int(x) for x in int_pixels]
+    def _convert_2bit(self, image: Image.Image, dithering: str):
+        """ Convert an image into a packed 2-bit frame, see _convert_1bit """
+        if dithering == 'floyd_steinberg':
+            luma = luminance(image)
+            return self._packer(2, luma).convert(luma)
+        pixels = np.array(image.convert('L'), dtype=np.float32)
+        return pack_2bit(dither(pixels, dithering, levels=4))
@@ -0,0 +1,142 @@
+"""
+Precomputed blue-noise threshold tile of distiller.utils.dither.
+
+Generated once with distiller.utils.dither.blue_noise_matrix(64, sigma=1.5,
+seed=0), running void-and-cluster takes too long to do on first use. To
+regenerate it:
+
+    base64.b64encode(blue_noise_matrix(64).astype('<u2').tobytes())
+"""
+import base64
+
+import numpy as np
+
+BLUE_NOISE_SIZE = 64
+
+# The 64x64 ranks as little-endian uint16, row by row, base64 encoded
+_BLUE_NOISE_64 = (
+    'agqAAKsLfgm0BMgPmAgiBDkKfg3sAHgOygFZD30KHwi4C78G1wMBAJAGlwHHC18C+AddBUwAHwRNBrgNnwkbD3wB4wVJBE0C'
+    'MAV6CakD0gHGD7EFUA4cBC4LcwUhDekD5wboCbkPFQagB+8EiwI/DowA2QR6BggOzgpoByMCQg/LBu4DBQ/HBYgBWwrcAioO'
+    'UQEdCaIGxQtNB9IC5wUjDS4B7A0VCV4MXw5xCdsFQw07DzcDogr+DMwI0QHhCqADDwj0DQEJXA0ZDHcOEwfUCkMICQA+DZgB'
+    'fwccD08A8wjQCxUCQQNmDcMB1w6cCSMH6gpsDU4IZwNiAHAMhAXcDTcI4gxkAn0IAgzSBrAM4AWoB5kPZQMgBfEI5A07BIIJ'
+    'hwLyBC0LCAKQBA8D5QqUAP4GMQlqDkUBvAt3BVYHggxwAocLiADFBjsDBQF6BaAMQQSLBs4LoQmOA0IMygI2Bu0OKAWOCCIK'
+    'YAsbBN4MXwG5AyEM2QExCoEPAgTKCRgBPQvVBPcJ0Q2GAyIP3wAfC2EC/wnqDDEATwpPDM8AhA41B20PMQj6BeYMkw89CM4E'
+    'KQz0ARIGBQhQA2sPDwCIDjQG8gPoD/AJSgg3D0IKegLFDgIJSgKCD7wFegpUCHoN3AqOADkOkwboAA0I2QXTD9sIRQXEDjQH'
+    '5QXJCAEMGgPED2gBPQZQAM4HKQV8Cf4DjQ69BHgGyQ4mAtIHXga4CgkMkgNsAGwKWQcgAQcK4A1wA+QP1gnpBGMMHgpmBG0J'
+    'PgjFCj4F+QHhCwQEcAclDeYAGgukBLYHrACDDtAEnAESBNYHawyhA04P9QsnAhsK7QYhAHQLwQJLDdIAVQ4gB9YIRg2gCr4O'
+    'cQs1Aj8NCwjaC0YBuwj7ChEE8w/rAiUFywHgCHwNpA78AwQMoALSBdsH+QpgAJUNeALRBlYNGALhDfYAnw5pBmkNSQBMCdEF'
+    'fAP0BhYOcQxzCXMC0QzdBusPQAq2BVwCiAkNBQQOUQOMDE8OKAReCAULxQRHAqsFCQTzAT4HWAQeCfgF1A+VANgGtw3+AnYM'
+    'ywVPCBANcgksD9MGfgVhAT0JqgbaDrYAKQ1bBA4H9w57CDEBpAvDBXMDbgzZB7YC6wrzBEMOpgvSD+UJbgEwA1AGqAvzB70J'
+    'DgNJAfYNJQtlB6YAggjiCkQBvgWyCZQBOg/JB3AKXQyVCS4P/wLEDHMBJgx9A6AJQQV8Co4HmwHyDWkAWQtUARcEpwx6CxQD'
+    'Gw3DBGgLzQm5CPwBeQuFA4oFiAq7DxYJHAdLClUEdwl3D3MIfgGlAvAH2gRjDZMISQ8rBGYAvQ7oBPgMoggUBAQPIA2nBmIE'
+    'RQ+TB1sNGAyCBjgDjg4rAIwHLAtHBWYIbA7GBrUKWgIoDu8Diw8tCasEIQq0BlwOwAdXAgYKUgjQD7UBcQfJAngPRQZkDpkJ'
+    '2Qz4ApoEagBTDuUBJA2uAPsGigOeDH4GygqGAMwLcgXaAREKfQ30BYkLPQcNADUG4AHJCdAC/gtICfABkQNKBbwABAl5DekF'
+    'lAwdAfENKQpYAEoE+Q6HCIoMEAAzBq4LOwIJDysDFgXaCrkNSAA+BM4FqQoDDvMDNQz9BJYBPwfRAA4O3gfsCyQF2QoPBrMO'
+    'bAtiBdYNLwktD7sDBAcFDhMLXAecAiAJpQFTCp8PlQxnCwYFhQ6FAEAGKAvdDVUKgA+FC5MEogLcDxgEUwZ0AscHxguiBS8B'
+    'DAfxCukCIg1CB5cIHwzKACgJHAYYD1cHIAzzAHwIiAYfAMwKog3dCLoL+QXOCWACPA9BCD0D3gguAuoJGQCKBDkCvgyjCeEA'
+    'awTDD5AMwgMiDosEpwIPCasDcgeFDWgI9g+oBDYIrAIwB7wBZwgWCvMGGwluDRkLcg8ZA0oNRAqABEQPWglOBfwApA3zBZcP'
+    'yQPSDLwC7giZDnsDCQ1gCukOewckA40E/QHWDrgDygzgBtgAtQ2/BGIMvQ+jB74LOgYqCHwOEQPHCD8GPwEOCAAMHgbcB6UO'
+    '3gDGCs8FmQFiA68MOwDPCVIOEAYsDMgA4wpWA38B7gRlCdoG2wE6CNcNqgGuB4IOPASHCvoBzAkJB00BpQs0BfIBeAmnBMQB'
+    'ZAVKCaYM+g/xBtcKQAAaCU0EmAtBCl4HDgHeBSwDvA5NChMBlAUyDIQKqA0IBQAKFg9+AC8L7QTnDHIC6QgkDHkK4wa6Dn0F'
+    '3gMWDegCEw63BecOAQj/DIQAYg7/A/kLFAZxA50MSwu7Ah4I3QuvBJYO5wd2CnUNVAZtC5oPFwjLDXsClwAYCkYFHQjCDSgG'
+    'rA+0AZEO4QJVDdUKkAiuAUUN6gNaDwUC8AYlAJELBwMKBzIC5w2mCboGAQ8mBBEODgUDAswHrwtgAW4KEgh9BK4M4gmzApAL'
+    'nQW5ChEJjg9HAOQJmQa7ALcPdAXMDYIAmAzgAncEMgA6DksHvwBdA+gK/QUPDOMDTA5ZAWYLdgL9CWwFUAiGBoQJMwQbDk0F'
+    'SQdGCVILAAhODh4Ejw9dCVcNXQRNCFQDJAGjC5IHkACxCSwNLQNhD/QIoAYlDxcAXwc0AaYGsQ+ZA7QHQwIMBTQLkQ25BL8I'
+    'OAoYB2gDDAlMBpQJ6Q9qCIUCPgojBdsMEwlXD0EHnQjjAhQNowSiB58MdgMLDIcBdQ9VAH4LwAKWDIcAAwVNAycKGQY8CJEB'
+    'nAXLCpkMwA/TBTMK7gJ7D+IFdQiMCp8AzAReDWkCfQvBDuQETAzOCIIBOw4KDccGAQMjCCYPOAIEDXkBIwsgD9MBnAuDBRkN'
+    '5QMoDOYOsQahAW0EJQG5DpcKhAZuCf8OfAAmDjMJ8QTIDB8Gzwe+CfkPewbiDUQM7wAHDZcCywvHDtYAYAf+ASEJMw2bBEEM'
+    'cAGTDl4EEwwkBr8JogOyCAQCvw35A14KMgZ4C9cAfwmrDiMBFgQbDAsGNQ7bBDMIDQTqDfIAfAe7CTIBrQjeArILYQ1nCVoF'
+    'DgD9C/cBwQPeBvAKjwKbB44KpANZDnoB8QOSCu4BtAj/BvQOEgUQCbUGpQNpCkQFAQ4VAC4IzwqFBmcCeAcQDqwB5w8YC4UF'
+    'vQeYCVwA8w7sApkEdghaDHwFvgoIB6gJOQOyByMAvwyZCusGNQNNCzkPSwaHBFsOvAdDCo0DzQ05CMwPzAV/DakIhAQfD9UA'
+    'ig1PAvwIGgxWBZUHHg8dAyYL4gN0CmgAgAwnDooI9guQAicHtw5gA28JQg1TC0wDSAjDBo0AGA0+A08GtQsgCGQNFQfuD8AD'
+    'HQJHDW0O2QBaC8oPDgrwBTACeg9JCRAFIAJsDMQKcwCyBekB4gYDC84CWgQECl4LhQFqDDkG3Al7BUoLyAbRDggAJg23CdwF'
+    'TAFoDUQH3Q/UAsgEJgF0D+cDOAvrBBQBqg9UBT8AEwraDC8ENw5ICncMpw+CAlUFnwH2CgMA+wmRBhYIrgSrCGEFaAJnDcsD'
+    'WQgIDFsAMg3VB5QDwA1CCasPzwvMDlMBzwysB54ANg8uAxMI4w3SA68PGwGMBDUI7Ap/AlYE2QuYDn4I4gHvCRoGlguHB50J'
+    '2AWdDS0KTQxPB8MI3QMSDwACKwkyBTUBmwi2BHEKXg5mCcYMqAXPDogLfQH7AusODQzWBi4JBAFKDpQEbwagDlcKFwH4BuYE'
+    'gAIxBJwISgYLBS0OUgmlBjMF0AowAEcJsAcxDPcNJgMlBnMPGAmZAJgG/ATBDP0DPwjZDSUC4QycAHoIzgEIBqECSQ4BCxsG'
+    '0wcRDLEOGgfvAb4N5QCDBxUEKAKgCDoDowxfCbANiQp7AEMEKw/6Ci4HhAuaAQUJmQVeD2wI9gxkCoAN+ADdCXULHwLUA/cL'
+    'dg5GAtYMDQNaBvYB7Qm2COoAgwxjB6ANlgrqAn8L+A4nAGcKsQPfBqkORgNbD0QJNw36AMoEpQyYAL4CugrOA+sLOAntBTkL'
+    'Tw+kBuYNtwSjANYFFgebA+wHDQ24BSICtQkiA8AMHQQtAsMLQAM3AO4FlwdYDlcDmA8iCKsNRwEpB+MJrgWqDgsLWQ3wA90O'
+    'MwvcBH8D6AGkD+gIOQESB24FgQ58DCwFKgukB5cEsQqqAxgI0AnLDwYHhgm6BWAPuweJAvwMWANtACoMVgraBzIP/AozApYP'
+    '2wllAawIPgw2BfIP0Qf8DbYKjAZjDtcISQv1ATMM5AZ4AL0FNQq4BK4I2w8lBAkIqAD6BGsHXQHQBh0OHAowCH4E6wWWDcEJ'
+    'owK1CFwB8QliAjoMQQCXDbkG6AsZAm4Dyg1UBO0MwwAICtIE9Q4sCIUJEwVSAeQCEQ3FCB8FWQxHBhkODAPIDhYAqAY2AWsJ'
+    'BAVvAWEMeQTaD7QDUQVBCToNDQuSAoYMWQBYC8IBaQxcCVAPawq9DFkC0AUODDkAyQwyC5ADPg8rDG8HDwTYD/sFBgl+DkAF'
+    'PQHgDtoFaQtlCJ0BCgtiBmEOnQtxAUYGTw26DzgHygshBIwBQA5NAGwE0gofBzgEKgqpDUcLaQPbDhsH4AnOAAwIowq/DnQB'
+    'YQTEB0cPgwYSDj8DygbfDWUCEQZjA3QI5g9FCR4DCw9VBxsCowaJAMsEJAtxDdMAugw6BwoDLgrtB+QMVgkLAEYPbwWQDSkD'
+    'VwAlBywEgQohAr4D/gj6DVIGBQqaB8ELdwhOAogNyQsGCMMCrwXpDF8IUwI7DZEFxw2OAlgH+wsADtUBlgPCCVcFhAhmCmoE'
+    'pgcSC0MArQuIBDoBswr0BNQIQA2bCiYICw4RApwGgQlfBMYBsQuhDzUEtwLYBDcHTApVAp0HIwn9D9UM2Ag+DoIL9wUgALsK'
+    'agIMD3kFIwPND7MJpwADBqcBiA80CeMANwRqDx4LTwNVCR0GCgCwCXEF0AiLCwgNWAF+D0AMFQHoDtcMWwVoDu8HmA3vBi4O'
+    '2gApBLAPjQUkCYcDkApBD0QIMA7VBdUIhAHpCqEOIwyJAzQOfQyRBBwCwAVCA8UAmQfLDOwO5wThB5IL0AA8DbIGGgWyDrcI'
+    '0AyiBCgH8ws2CkMG3weGARwMhA88Cx8DFA/uBooA1gTUB5UCKgb9CBYDtAnPBg8CugNLDJsFdwKhC5MJ5QInAakMtg4UAGUF'
+    'pgLvCnQANQ2AB64NLAa4AMYIiQYJAeQKBAg5DDQPKAqBBLkCrAnIAWUNgQMDCXcK2AFTDMgD/Qr0AtIJxg43AtANRgDTBKcO'
+    '2wN+B74EYg0MAogMOgrTDoMNKgR2CywO9wTiAGUPqgoJCWUA/AnvDrMHJgbwDccKfAZQBL4HVwyZDQ0HxwMaCkMFeQKeCWkE'
+    'mw9dCy4Fjwm/A50GkgFJCGAOgQbUC5YIBAZVDyEHgwQUDgoICwEAB+4NegAtBsUDgAh7C6cJBQ28CLMAXQpcBmIInwPCBZAB'
+    '2QidCh0ALQcfDRQIlQuxBHsNggeEA+wMiwGgBAYM/AckAscJgwuxASoJ4gRuD9ILKgH2DmQM9AfUAegMsQLlDjwAsAumDU8F'
+    '1goCAdEPEARyABQMVwEhC98CwwldD4IFPQzqB9EKoQyPBXMOvQFwBsYCfwxnDoMBEAu0D2EHJQz3Ap4G8A9RAlEK3wOJAVsG'
+    'mgLHDxsFDwvkCEMPXQDWA9wM4g+SBWEDnQ60ANgH5wKRCI0GnApDA8kFEAroBs8Nigr6CAwEFwIDDU4DRQdhCiMOVAkvBZsO'
+    'MQbjCyAENwm2AWgElA9tAeYCUwf3A+0PIwrUBTkEZAmcDUQAhQTuCaIOSAV1DG4IuwUkD2YMRQ6KCeYLLQHJBhUDGQpMByEO'
+    'zwjkAAUHSA0MCiIG2AoVDrQMIwQkAI8Oaw0aAVcIwQSUAloHjA+HCScGYwhUDPAErwLxB0QN+wGnBwUAUw2MAmYOAgqWBuII'
+    'LQ2oClEIxAtPAcgHBg9JAmsF5gcLDRMCmQjtALUDxg1DAfsIIAO1B5EApgWUCMMOMQ3dAQEFmAqNApYEGwsVCHECkQzaA48B'
+    'dQXqD+wIEQcWC9ADbw8HDBcN3QUWAYAL2A0vALUOzQFFC3MGpwORCf4P0wq1BTwHmQtcA7MNNACdBPIO6QA4BdUNMgOaC7cG'
+    'SQxqA7IKCQ7hBtYLKwrCBIELvQbzCo4Eewq4DFgCGgQxCy8Ghg80DHQGjg37DhkBJgWRDzIJbQcUCpYClAvGBA4CWwkTBqIA'
+    'rgOJDusH1wJvBDQKpAUZCbsMPw+bAEgMlQTYAvgIDg++ADsIsAUtDFkJqQaKAq0MAAmeCnYASwh/DwoJDQHFBTwDkA/iB5gC'
+    '6g7JAP0N5AFkD+UGCg5gCasH8QCIA2AIMwC2CSgD5QieC2YGawC6DRIMcgbAAGUO2AzDBykO+QlMCAAFhgpoDOkGqA82A4oH'
+    'OwFCBHAIgAq4BgYOaQF0DM0EFws9Ar8PdQNzCzgORgfgA+8FUQ5cBNwBBwWGDo0MjAlaAFYGtgxeBbgJRgwGBtMImAMAADUF'
+    'ZQzEDecJeQ6GBe8LHgc0BE0ORQLmCrMESQMhD1sI0QlkAy0FgQFVC7YN3wFND6AA4wjrAQwLmw3rCUQOaAVAAu4MEAjRA4MJ'
+    'eQb7DTcKageVAWcF2AmtAKMPCgLyC3YJiQ1QCpEHUgJ2BBQL+A2OAY0I2QOJB88CTg0gCsAL5Q8SA6IB9gZzBD8CaA9jAR0K'
+    'tQyYB/EOvQhsASsNjAXXAUcMig8BBwADygWACSQEIQYrDs4MqgRBBq0CDwdCC5IP9ACOBXALYg8JAzwBZwScDqMIUQ0uBC0I'
+    'bQxFCoYH/AKABjoAoAsWBs0OCAhbA1kKaQ9cC3EA/A5TBV4B/gdqBrQKhQibCzgNbQpCCKoN8gXEAI8DZgX4CQsHtwr6A5wH'
+    'dQr9ANEI0wsEAPkMoQdhC28DOAjMAO4O1QsoAOYIegMKCoAOBgKBBzkN3AiODOwFdwCVCg8P0QJjBqYEEQEqD34MzQPVD/II'
+    'TgFNDYEFBwdrAvYEvAxdCOcK9QOUDmYCzwQHD5wDfQCVBiED1ARXC6gI/g1nDDgApg+RAt8Low7qBTQNjwTUDt0K1QIQDywB'
+    'VAppBZIJdgcZBG8N+QR6DGQGiQhxBKUKIgDEBgMKNAMVDLYGugH9DDULjA5RCX8FWAjbChcFywJSDJYJsQDlC9MNqQlZBgsC'
+    'IA7cBqoM/gndAIwNzQUpCdUOsQzWAfQPwQbEAvQKTgQrBm0NCwl/AJUDrgluAtcGRgQmCWgG4AtUAuwPqAzJARcKWA+5B28C'
+    '6A2rAD8MwQXFDQoEeQ/nAVoO3QfdBPYIAgCMAycNFgL1DcEArwckDrwGvQOeD8oHPwTuADEPsANwCVYAkAVACAUMZwd/CooB'
+    'zQu3B+kJ6wNNCRwBywdXDmQIrQH/BF0HSAvhDycIpQ13AaIMHAXzDaUI6AOHBkwL+QINBngBWAlUC18D4w9QCbICBAtVCDwF'
+    'RgumAzwK9w84BhwIwQr8Bl4D8wn0C8ABjQpJBTALKwIHCV8MnwqNB+0LrQ0nA6UPMgQ2AkgP3wTtAqcFEQAcDY0LFQ/EBS8D'
+    'tAvICQMP8wwvAjsG8ABHClMP+gdHA0oAUAdSDf4ArA5aCPoMvArfDuMEmgbyB7gBkg47BwwBoQ0fCZIAQwwqAnMNTARLAVgM'
+    'bA8YBlIEpg6BCBoADA2hBnoOowWpAscEkwGGCA4LEAGNCVUGmwx4CDEOBwuuDmwGtQTqAV8KEw2aAK0G8QJ4Cq0EGA6/C3AF'
+    'pAI+C3UOfQkJCwkFQwmXA4cFXwAABEMHBgEuDU4KiQSrDJcF3AuEAl8GtA5UB3gFIAvkDosJPQWVCFsCQQ0zB2sDLw88CfgD'
+    'SgERCPgP1AxuBuIOCgU5B3IOXwtwANMD+gZQAeEISwMZCMkN+Qg3BcIPSAQ3DEcILgDwCGYDGQe0DaABkgYGBCMPgwIMDLIN'
+    '9Qm8DxYMywg9DtoCjAtUANoISAOtD4kJfwQdDQMDzQi6AJAH1gJpDlIAKwtiCR4Btwv+BYYC6QvIDd4JRQD/CtUDpQl+Aj0N'
+    'bANcBf8Ijw1lCt8MVgKiD+oLuQDVBkQCCAutB3YBlA13BnEPVQzfCVYIOgViCnMM1ADmBf0GqAGpB7gCYQbjAdUJ1wVjDxcH'
+    'kw09CrAAjwdkC3UB9glMD9gDnAwOBsgLCASUBuAPOQXXCacNhQd+CuEE7AYIA6cImg1iAbYL9gePCrkB3g+wAvYFyQS5CUAH'
+    'JwQBCp4OxgPgDGoJzg5CBUYKAQJ0BPkA9QzOD/AClAeCDesIcA+LCqEEjwvODSEFhQyeA28IKQLeBG0GPA6yA+MO3wV5DOwE'
+    'bwoyDjgB2Ql2DQIIMwOPDBACdQR5AIUP/wGkDMsOHgUxB2cP8QUbABcOsAa7C7oH0g6PAHcLrA2yAaAFYAxRB2MA9QV8AswD'
+    'jgt5B4cOKQZqC2QAOgl4BM8BrAuLAxgASA7fCMcA5AfQDgoBrgpxDjAMgAHgCrAINAIvBz4AGghLAuYGrwilBAcC3g6pAKYI'
+    '3gq7Di8ILgbqCOYDTguyABIKwgLxDL4IswPsCZ4ENwFODHEIggMjBjMPHAvdAhIJSw9oCtINoQihALkMDglTAzIH/gTUDawK'
+    'rQ5fBeAHSgyXBgYDSQo9BEALvgZMBSUJAQT7BxUNvASeDY4J2Q/yCloNgAN2D60KHQeGC+QFHg7NBpMD7wzYCxIBSw4KBhsI'
+    'hwxHBK8KSwUwD0ICYA0ICQQDuwYADTUJUQDjBw8FXQ1rAbAEFwyuBq4PiAVeAkoKqwE8DAMImwJ1BtoJQAHcDj8FxwypD7AB'
+    'TA3FAn0PPQDeDcwCPAbnADcL7wIHBF0GIQHCC7kFEwDlDNwDCQrABPcAVwk6AisFvwqXCYECyQ/QAasGXQ5aAbEHJwuqBZUO'
+    'MAqzD+EBhgSwCnAO7AFjC44GMggbAzABqwlABHcNFw+0BYMDUg+TABINCwQdC4sIEgJ1CRQHGAUrCK8JCgx6B3wLLAqcDyIJ'
+    'lQUMDvoLjAj7BO0NMAn9An0OaQhIAjANogvBDzYHcA1EA2YHmARJDRcJ5AtVA3kJWwx1AAMHxAPcAIAFTwvpDfUGWgO4CO8P'
+    '+wOsDH8O+AqIB94LDAByCFYOmwnOBkQL0gj8D/MCag18BNcLZwD3CrAO7QM+AcgFHgJjBCwHNgz4AcIHbwAIDw8KtwG/B1EL'
+    'fwZBAVEPbAcYA7MFOwoeAB0PHQxyAd8KkwVTAFsHnQ9yBPkNxAgaDdEL9we6AsUJCAEQDOgFMgo1ADYJFAInBfAOSgNxBjoL'
+    'UwT/AMIM0QTmAa0FbgcBAVEGGg9FA/AMDQJ9BhoO3QyzCIoOiwCaA9gO0wmzBp4C8gy2A74PuwSkCf8LdgWUCu0IpAF7DhME'
+    'wAg3Bg8OzQfDA40NkwrxAUkG0wKFCrsBTwSHDQEGOA8pCLoEUA2oAn0Hkg0+BiUKjQH0DGgJQQLDDVIKEwPGB2sOkQpcDDYO'
+    '9whzCosHmgU7CZoKpQf2AhELYAV0DaQKGQUoDTYEKQufBVIHRQyDAK4CXw0DBLUAvA0nDOkHUAVWC80C9AkHATUPiAjgBDsM'
+    'Pwn+DmoFTgdmD0sJBwDKA4EMxwGXDr0KWQQnDxADIgySCJ8E1w8QBygIoQUoD5cLKQC3A3sJ6gS1ArcA2g1FBLYPEgDEBPoO'
+    'KAFsCWQHMQJ/CA8Bgw9ACesARw4kCgcGEw/1B9kGyg5tA5sGYwLjDKQAuA+pBIkMCQa0AjMOKQHFB8UMnQCpC30C7grMBh8O'
+    '+gl2BoMIpQCpBUML+QfLABwOAAaBAC4MewEODSwCDQlEBoQNzAECB3wPPwuaCLMBkwxbC1MIUAyKBvYD9Q+9C/8FcgzyAgcI'
+    'sws8AnIDygj+Cp4BnwtOCfgE9QqPCAcOWgr3BicJCQKKC7wJ6gZBC/UCBQTGCS8O9QRhCGcBbwsUBQsD2wuHD2EJwQEGDdQG'
+    '5ANlCy8KfgPXBNQJSAdEBLUPXAo0CAMMWQP8BVQNIge/AjAGvAMCAlgKzQxOADEDCwolDvkGsgT9DmcGeAxuBOsNWAXbAg8N'
+    'SwBWD1UB9APGBRcDeA2qB+EOJgBXBPEPvwWvDSUIjwZ5A/cM1g8+AsEHKg1CAUoHrQNBDgIFkAlfD1ACqggCD+0KDQ7NAFEM'
+    'nwJSBZYAwg7ECUgB7ANjCq8OdAkvDVwPwQgqBVQO/QdgBKYBFQstAMAJnw1bAZ4HbgC6CfsPJAhYBpoMoglzBwoPUAvGAGMF'
+    'rAMCDboIFQrgAPEL7QHZDl4APwqsBe8IuA46BM0Kuw1CBqEKvQKEDCIBhAdyDU4G2QJFCIkFNgtCDp8H6wx7BJ8G/w2qCwUF'
+    '7gdkAZYFwgB1B50COwtgBj0P9Qg2DaUFnQNrCMMKKQ+3DPIG4QPeAcIKegSIAh4MxQFGCEYOaQnAClcGXQICDkcHggqSBDkJ'
+    'OAwqBw4E5wuvAMsJOwUaAhQJHADADlwIWQX8CzAENgCLDJUPzwPnCGYBqANPCQALkwLCCEIA3w9tArENpwrwC0sEvQ2aCfUA'
+    '4gtsAmkHzw8vDJkC5QQCBioDcgpuDpgFwQ3ICHQOiwXyCVEEqgKXDGoBGQ8hCBEFdAOBDUgG4gJUD78B5Q3IAmsGWA10B7IP'
+    'VgyCBMIGIgsCA+YJiw4kB2MJvgFlBqgOpgoFBtsNowFAD3cHswwgBuEJrwPbBpoOLAmvAZ4FAQ14Ax0FgwrbAKwGkA6pAVMJ'
+    '+Au9AHkIpwv7AFIDJgcsAPsMSg8XBmIHnAS5C6oAbwyJDx8BkwvQBzEFyAr/B14JDQ+jAysBbgscA+gH0wwAAf8PDAZWAXIL'
+    'IgWGDbgHxwLDDAYAKwfuC20FJQPJCnAEbQh7DGEAFQX6AsUPqwrXBwAPngjvDS0EqgliC4sNlgegD6sCrATABrIMHwqNDwYL'
+    '5QczAWsLow0cCQUDJgqvBqQIdQKtCW8OAwHMDGUEKgACC5IMsQjhBQ0KEQ9MAj4JZAQeDZ8IdwM='
+)
+
+
+def blue_noise_tile() -> np.ndarray:
+    """
+    Decode the precomputed tile.
+
+    :return: A 64 x 64 int array holding every value from 0 to 4095.
+    """
+    ranks = np.frombuffer(base64.b64decode(_BLUE_NOISE_64), dtype='<u2')
+    return ranks.reshape(BLUE_NOISE_SIZE, BLUE_NOISE_SIZE).astype(np.int32)
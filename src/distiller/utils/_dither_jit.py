@@ -0,0 +1,117 @@
+"""
+Numba kernels of distiller.utils.dither.
+
+Imported on demand by distiller.utils.dither.warm_up, importing numba and
+compiling (or loading the on-disk cache) takes seconds on the device, the
+dither module has pure Python versions of these kernels to use meanwhile.
+"""
+import numpy as np
+from numba import jit
+
+
+@jit(nopython=True, cache=True)
+def floydSteinbergDithering_numba(pixels: np.ndarray) -> np.ndarray:
+    """ See distiller.utils.dither.floydSteinbergDithering_numba """
+    for y in range(pixels.shape[0] - 1):
+        for x in range(1, pixels.shape[1] - 1):
+            old_pixel = pixels[y, x]
+            new_pixel = np.round(old_pixel / 85) * 85
+            pixels[y, x] = new_pixel
+            quant_error = old_pixel - new_pixel
+            pixels[y, x + 1] += quant_error * 7 / 16
+            pixels[y + 1, x - 1] += quant_error * 3 / 16
+            pixels[y + 1, x] += quant_error * 5 / 16
+            pixels[y + 1, x + 1] += quant_error * 1 / 16
+    return pixels
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def floyd_steinberg_rows(pixels: np.ndarray, start: int, stop: int, levels: int) -> np.ndarray:
+    """ See distiller.utils.dither.floyd_steinberg_rows """
+    height, width = pixels.shape
+    step = 255.0 / (levels - 1)
+    for y in range(start, min(stop, height)):
+        for x in range(width):
+            value = np.floor(pixels[y, x] + 0.5)
+            level = min(max(np.floor(value / step + 0.5), 0.0), levels - 1.0)
+            new_pixel = level * step
+            pixels[y, x] = new_pixel
+            quant_error = (value - new_pixel) / 16
+            if x + 1 < width:
+                pixels[y, x + 1] += quant_error * 7
+            if y + 1 < height:
+                if x > 0:
+                    pixels[y + 1, x - 1] += quant_error * 3
+                pixels[y + 1, x] += quant_error * 5
+                if x + 1 < width:
+                    pixels[y + 1, x + 1] += quant_error
+    return pixels
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def atkinson_rows(pixels: np.ndarray, start: int, stop: int, levels: int) -> np.ndarray:
+    """ See distiller.utils.dither.atkinson_rows """
+    height, width = pixels.shape
+    step = 255.0 / (levels - 1)
+    for y in range(start, min(stop, height)):
+        for x in range(width):
+            old_pixel = pixels[y, x]
+            level = min(max(np.floor(old_pixel / step + 0.5), 0.0), levels - 1.0)
+            new_pixel = level * step
+            pixels[y, x] = new_pixel
+            quant_error = (old_pixel - new_pixel) / 8
+            if x + 1 < width:
+                pixels[y, x + 1] += quant_error
+            if x + 2 < width:
+                pixels[y, x + 2] += quant_error
+            if y + 1 < height:
+                if x > 0:
+                    pixels[y + 1, x - 1] += quant_error
+                pixels[y + 1, x] += quant_error
+                if x + 1 < width:
+                    pixels[y + 1, x + 1] += quant_error
+            if y + 2 < height:
+                pixels[y + 2, x] += quant_error
+    return pixels
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def floyd_steinberg_pack(luma: np.ndarray, out: np.ndarray, errors: np.ndarray,
+                         start: int, stop: int, flip: bool, bits: int) -> None:
+    """ See distiller.utils.dither.floyd_steinberg_pack """
+    height, width = luma.shape
+    per_byte = 8 // bits
+    row_bytes = (width * bits + 7) // 8
+    for r in range(start, min(stop, height)):
+        if r == 0:
+            errors[:] = 0
+        src = luma[height - 1 - r] if flip else luma[r]
+        current = errors[r & 1]
+        below = errors[(r + 1) & 1]
+        below[:] = 0
+        index = r * row_bytes
+        packed = 0
+        count = 0
+        for x in range(width):
+            # current[x + 1] is the error of pixel x, the padding takes the error leaving the row
+            value = np.int32(src[x]) + ((current[x + 1] + 8) >> 4)
+            # Nearest level: thresholds halfway between 0 and 255, or between 0, 85, 170 and 255
+            if bits == 1:
+                level = 1 if value >= 128 else 0
+                error = value - 255 * level
+            else:
+                level = (value >= 43) + (value >= 128) + (value >= 213)
+                error = value - 85 * level
+            current[x + 2] += error * 7
+            below[x] += error * 3
+            below[x + 1] += error * 5
+            below[x + 2] += error
+            packed = (packed << bits) | level
+            count += 1
+            if count == per_byte:
+                out[index] = packed
+                index += 1
+                packed = 0
+                count = 0
+        if count:
+            out[index] = packed << (bits * (per_byte - count))
@@ -122,6 +122,9 @@ class HijackEink:
         Initialize the HijackEink class.
         """
         from distiller.peripheral.eink import Eink
+        # The dialog owns the panel until destroy(), the app's instance must not
+        # refresh or power it down meanwhile
+        self._suspended = Eink.suspend_all()
         self.eink = Eink()
     
     def update_screen_1bit(self, image: Image.Image) -> None:
@@ -136,4 +139,10 @@ class HijackEink:
         """
         Destroy the e-ink object.
         """
-        del self.eink
+        try:
+            self.eink.close()
+        finally:
+            del self.eink
+            for eink in self._suspended:
+                eink.resume()
+            self._suspended = []
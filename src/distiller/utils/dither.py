@@ -0,0 +1,492 @@
+import logging
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from distiller.utils._blue_noise import blue_noise_tile
+
+# Rows start to stop of a float pixel array are dithered in place to `levels`
+# evenly spaced gray levels. Rows before stop are final afterwards, so a frame
+# can be dithered band by band.
+DitherEngine = Callable[[np.ndarray, int, int, int], None]
+
+
+# The numba kernels (distiller.utils._dither_jit) once warm_up loaded them. Until
+# then the pure Python versions below run, so nothing imports numba up front.
+_jit = None
+_warm_up_thread: Optional[threading.Thread] = None
+_warm_up_lock = threading.Lock()
+
+
+def warm_up(block: bool = False) -> None:
+    """
+    Load the numba kernels on a background thread, compiling them if their
+    on-disk cache is missing or stale.
+
+    Until they are loaded the kernels run in pure Python, several times slower
+    but without importing numba, so the first frames of an app do not wait for
+    the JIT. Run `python -m distiller.utils.dither` once after installing to
+    fill the cache.
+
+    :param block: Wait until the kernels are loaded or failed to load.
+    """
+    global _warm_up_thread
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=_load_jit, name='dither-jit', daemon=True)
+            _warm_up_thread.start()
+    if block:
+        _warm_up_thread.join()
+
+
+def jit_ready() -> bool:
+    """Whether the numba kernels are loaded, see warm_up."""
+    return _jit is not None
+
+
+def _load_jit() -> None:
+    global _jit
+    start = time.perf_counter()
+    try:
+        from distiller.utils import _dither_jit as kernels
+
+        # Call every kernel with each argument type the pipeline passes, so all
+        # the specializations are compiled or loaded from the cache now
+        pixels = np.zeros((4, 8), dtype=np.float32)
+        kernels.floydSteinbergDithering_numba(pixels)
+        kernels.floyd_steinberg_rows(pixels, 0, 4, 2)
+        kernels.atkinson_rows(pixels, 0, 4, 2)
+        out = np.zeros(8, dtype=np.uint8)
+        errors = np.zeros((2, 10), dtype=np.int32)
+        luma = np.zeros((4, 8), dtype=np.uint8)
+        frozen = luma.copy()
+        frozen.setflags(write=False)  # np.asarray of a PIL image is read-only
+        for image in (luma, frozen):
+            kernels.floyd_steinberg_pack(image, out, errors, 0, 4, False, 1)
+    except Exception as e:
+        logging.warning(f"numba dithering kernels unavailable, staying on the Python versions: {e}")
+        return
+    _jit = kernels
+    logging.info(f"numba dithering kernels ready in {time.perf_counter() - start:.1f}s")
+
+
+def floydSteinbergDithering_numba(pixels: np.ndarray) -> np.ndarray:
+    """
+    Apply Floyd-Steinberg dithering to an image.
+
+    Diffuses towards 4 gray levels and leaves the border pixels as they are,
+    the 'floyd_steinberg' engine (floyd_steinberg_rows) is what the display
+    pipeline uses.
+
+    :param pixels: The input pixel array.
+    :return: The dithered pixel array.
+    """
+    if _jit is not None:
+        return _jit.floydSteinbergDithering_numba(pixels)
+    height, width = pixels.shape
+    if height < 2:
+        return pixels
+    current = pixels[0].tolist()
+    for y in range(height - 1):
+        below = pixels[y + 1].tolist()
+        for x in range(1, width - 1):
+            old_pixel = current[x]
+            new_pixel = round(old_pixel / 85) * 85
+            current[x] = new_pixel
+            quant_error = old_pixel - new_pixel
+            current[x + 1] += quant_error * 7 / 16
+            below[x - 1] += quant_error * 3 / 16
+            below[x] += quant_error * 5 / 16
+            below[x + 1] += quant_error * 1 / 16
+        pixels[y] = current
+        current = below
+    pixels[height - 1] = current
+    return pixels
+
+
+def floyd_steinberg_rows(pixels: np.ndarray, start: int, stop: int, levels: int) -> np.ndarray:
+    """
+    Apply Floyd-Steinberg dithering to rows start to stop of an image, in place.
+
+    Rounds like floyd_steinberg_pack, so an image of whole luminance values
+    comes out as the same levels as the fused packer gives. The error of the
+    last row is carried into the next one, so dithering an image band after
+    band in order gives the same result as dithering it at once, and the rows
+    before stop are final.
+
+    :param pixels: The input pixel array.
+    :param start: First row to dither.
+    :param stop: Row after the last one to dither.
+    :param levels: Number of gray levels to quantize to.
+    :return: The dithered pixel array.
+    """
+    if _jit is not None:
+        return _jit.floyd_steinberg_rows(pixels, start, stop, levels)
+    height, width = pixels.shape
+    step = 255.0 / (levels - 1)
+    rows = range(start, min(stop, height))
+    if not rows:
+        return pixels
+    current = pixels[rows.start].tolist()
+    for y in rows:
+        below = pixels[y + 1].tolist() if y + 1 < height else None
+        for x in range(width):
+            # Errors are carried in 1/16 units, the packer rounds their sum once per pixel
+            value = math.floor(current[x] + 0.5)
+            new_pixel = min(max(math.floor(value / step + 0.5), 0), levels - 1) * step
+            current[x] = new_pixel
+            quant_error = (value - new_pixel) / 16
+            if x + 1 < width:
+                current[x + 1] += quant_error * 7
+            if below is not None:
+                if x > 0:
+                    below[x - 1] += quant_error * 3
+                below[x] += quant_error * 5
+                if x + 1 < width:
+                    below[x + 1] += quant_error
+        pixels[y] = current
+        current = below
+    # The next row holds the error carried out of the last one
+    if current is not None:
+        pixels[rows.stop] = current
+    return pixels
+
+
+def atkinson_rows(pixels: np.ndarray, start: int, stop: int, levels: int) -> np.ndarray:
+    """
+    Apply Atkinson dithering to rows start to stop of an image, in place.
+
+    Spreads 6/8 of the quantization error over the next two pixels and the
+    three below and one two rows below, which keeps flat areas cleaner than
+    Floyd-Steinberg at the cost of some contrast in the shadows and highlights.
+
+    :param pixels: The input pixel array.
+    :param start: First row to dither.
+    :param stop: Row after the last one to dither.
+    :param levels: Number of gray levels to quantize to.
+    :return: The dithered pixel array.
+    """
+    if _jit is not None:
+        return _jit.atkinson_rows(pixels, start, stop, levels)
+    height, width = pixels.shape
+    step = 255.0 / (levels - 1)
+    rows = range(start, min(stop, height))
+    if not rows:
+        return pixels
+    current = pixels[rows.start].tolist()
+    below = pixels[rows.start + 1].tolist() if rows.start + 1 < height else None
+    for y in rows:
+        below2 = pixels[y + 2].tolist() if y + 2 < height else None
+        for x in range(width):
+            old_pixel = current[x]
+            new_pixel = min(max(math.floor(old_pixel / step + 0.5), 0), levels - 1) * step
+            current[x] = new_pixel
+            quant_error = (old_pixel - new_pixel) / 8
+            if x + 1 < width:
+                current[x + 1] += quant_error
+            if x + 2 < width:
+                current[x + 2] += quant_error
+            if below is not None:
+                if x > 0:
+                    below[x - 1] += quant_error
+                below[x] += quant_error
+                if x + 1 < width:
+                    below[x + 1] += quant_error
+            if below2 is not None:
+                below2[x] += quant_error
+        pixels[y] = current
+        current, below = below, below2
+    # The next two rows hold the error carried out of the last one
+    for y, row in ((rows.stop, current), (rows.stop + 1, below)):
+        if row is not None:
+            pixels[y] = row
+    return pixels
+
+
+def floyd_steinberg_pack(luma: np.ndarray, out: np.ndarray, errors: np.ndarray,
+                         start: int, stop: int, flip: bool, bits: int) -> None:
+    """
+    Floyd-Steinberg dither, quantize and pack rows start to stop of a frame in one pass.
+
+    Reads each luminance pixel once, carries the error to the next pixel and the
+    next row in two integer row buffers, in 1/16 pixel units, and writes the
+    packed bytes straight into out. The numba kernel allocates nothing. Rows are
+    converted in order, errors reset at row 0, so a frame can be converted band
+    by band.
+
+    :param luma: The 8-bit luminance image.
+    :param out: The packed frame, width * height * bits / 8 bytes.
+    :param errors: The error rows, int32 of shape (2, width + 2).
+    :param start: First output row to convert.
+    :param stop: Row after the last output row to convert.
+    :param flip: Output row r is image row height - 1 - r, e.g. for frames fed bottom row first.
+    :param bits: Bits per pixel, 1 (black and white) or 2 (4 gray levels, first pixel in the high bits).
+    """
+    if _jit is not None:
+        _jit.floyd_steinberg_pack(luma, out, errors, start, stop, flip, bits)
+        return
+    height, width = luma.shape
+    per_byte = 8 // bits
+    row_bytes = (width * bits + 7) // 8
+    rows = range(start, min(stop, height))
+    if not rows:
+        return
+    # Same arithmetic as the kernel, so both give identical frames
+    current = [0] * (width + 2) if rows.start == 0 else errors[rows.start & 1].tolist()
+    for r in rows:
+        src = (luma[height - 1 - r] if flip else luma[r]).tolist()
+        below = [0] * (width + 2)
+        row = bytearray(row_bytes)
+        index = 0
+        packed = 0
+        count = 0
+        for x in range(width):
+            value = src[x] + ((current[x + 1] + 8) >> 4)
+            if bits == 1:
+                level = 1 if value >= 128 else 0
+                error = value - 255 * level
+            else:
+                level = (value >= 43) + (value >= 128) + (value >= 213)
+                error = value - 85 * level
+            current[x + 2] += error * 7
+            below[x] += error * 3
+            below[x + 1] += error * 5
+            below[x + 2] += error
+            packed = (packed << bits) | level
+            count += 1
+            if count == per_byte:
+                row[index] = packed
+                index += 1
+                packed = 0
+                count = 0
+        if count:
+            row[index] = packed << (bits * (per_byte - count))
+        out[r * row_bytes:(r + 1) * row_bytes] = np.frombuffer(row, dtype=np.uint8)
+        current = below
+    errors[rows.stop & 1] = current
+
+
+class FloydSteinbergPacker:
+    """
+    Fused Floyd-Steinberg conversion of 8-bit luminance images into packed frames.
+
+    The frame buffer and error rows are allocated once and reused by every
+    frame, so converting a frame allocates nothing. The returned frame is only
+    valid until the next conversion, and a packer must not be shared between
+    threads.
+    """
+
+    def __init__(self, width: int, height: int, bits: int = 1) -> None:
+        """
+        :param width: Frame width in pixels.
+        :param height: Frame height in pixels.
+        :param bits: Bits per pixel, 1 for 1-bit frames and 2 for 4-gray frames.
+        """
+        self.width = width
+        self.height = height
+        self.bits = bits
+        self.row_bytes = (width * bits + 7) // 8
+        self.frame = np.zeros(self.row_bytes * height, dtype=np.uint8)
+        self._errors = np.zeros((2, width + 2), dtype=np.int32)
+
+    def convert(self, luma: np.ndarray, flip: bool = False) -> np.ndarray:
+        """
+        Convert a whole frame.
+
+        :param luma: The 8-bit luminance image, height x width.
+        :param flip: Emit the rows bottom first.
+        :return: The packed frame, a view of the reused buffer.
+        """
+        floyd_steinberg_pack(luma, self.frame, self._errors, 0, self.height, flip, self.bits)
+        return self.frame
+
+    def bands(self, luma: np.ndarray, band_rows: int, flip: bool = False) -> Iterator[np.ndarray]:
+        """
+        Convert a frame band by band.
+
+        :param luma: The 8-bit luminance image, height x width.
+        :param band_rows: Rows per band.
+        :param flip: Emit the rows bottom first.
+        :return: An iterator over the packed bands, views of the reused buffer.
+        """
+        for start in range(0, self.height, band_rows):
+            stop = min(start + band_rows, self.height)
+            floyd_steinberg_pack(luma, self.frame, self._errors, start, stop, flip, self.bits)
+            yield self.frame[start * self.row_bytes:stop * self.row_bytes]
+
+
+def bayer_matrix(size: int) -> np.ndarray:
+    """
+    Build the index matrix of ordered Bayer dithering.
+
+    :param size: The matrix size, a power of 2.
+    :return: A size x size int array holding every value from 0 to size^2 - 1.
+    """
+    matrix = np.zeros((1, 1), dtype=np.int32)
+    while matrix.shape[0] < size:
+        matrix = np.block([[4 * matrix, 4 * matrix + 2],
+                           [4 * matrix + 3, 4 * matrix + 1]])
+    return matrix
+
+
+def blue_noise_matrix(size: int = 64, sigma: float = 1.5, seed: int = 0) -> np.ndarray:
+    """
+    Build a blue-noise index matrix with the void-and-cluster method.
+
+    Too slow to run on the device, the 'blue_noise' engine uses the tile this
+    generated once, see distiller.utils._blue_noise.
+
+    Pixels are ranked by inserting each one into the largest void of the
+    pixels ranked before it, voids being the minima of a Gaussian-filtered,
+    toroidally wrapped pattern. The matrix tiles without seams.
+
+    :param size: The matrix size.
+    :param sigma: Standard deviation of the Gaussian filter, in pixels.
+    :param seed: Seed of the initial random pattern, the result is deterministic.
+    :return: A size x size int array holding every value from 0 to size^2 - 1.
+    """
+    offsets = np.minimum(np.arange(size), size - np.arange(size))
+    kernel = np.exp(-(offsets[:, None] ** 2 + offsets[None, :] ** 2) / (2 * sigma ** 2))
+
+    def splat(energy: np.ndarray, index: int, sign: float) -> None:
+        energy += sign * np.roll(kernel, divmod(index, size), axis=(0, 1))
+
+    # Initial pattern: a tenth of the pixels, relaxed by moving the pixel of
+    # the tightest cluster into the largest void until that is a no-op
+    pattern = np.zeros(size * size, dtype=bool)
+    pattern[np.random.default_rng(seed).choice(size * size, size * size // 10, replace=False)] = True
+    energy = np.zeros((size, size))
+    for index in np.flatnonzero(pattern):
+        splat(energy, index, 1.0)
+    flat = energy.reshape(-1)
+    while True:
+        cluster = int(np.argmax(np.where(pattern, flat, -np.inf)))
+        pattern[cluster] = False
+        splat(energy, cluster, -1.0)
+        void = int(np.argmin(np.where(pattern, np.inf, flat)))
+        pattern[void] = True
+        splat(energy, void, 1.0)
+        if void == cluster:
+            break
+
+    ranks = np.zeros(size * size, dtype=np.int32)
+    ones = int(pattern.sum())
+    # Rank the initial pixels by removing the tightest cluster first
+    removed, removed_energy = pattern.copy(), energy.copy()
+    removed_flat = removed_energy.reshape(-1)
+    for rank in range(ones - 1, -1, -1):
+        cluster = int(np.argmax(np.where(removed, removed_flat, -np.inf)))
+        removed[cluster] = False
+        splat(removed_energy, cluster, -1.0)
+        ranks[cluster] = rank
+    # Rank the others by filling the largest void first
+    for rank in range(ones, size * size):
+        void = int(np.argmin(np.where(pattern, np.inf, flat)))
+        pattern[void] = True
+        splat(energy, void, 1.0)
+        ranks[void] = rank
+    return ranks.reshape(size, size)
+
+
+@lru_cache(maxsize=None)
+def _matrix(engine: str) -> np.ndarray:
+    return bayer_matrix(8) if engine == 'bayer' else blue_noise_tile()
+
+
+@lru_cache(maxsize=8)
+def _threshold_map(engine: str, height: int, width: int) -> np.ndarray:
+    """ The thresholds of an ordered engine, in [0, 1), tiled over a frame """
+    matrix = _matrix(engine)
+    thresholds = ((matrix + 0.5) / matrix.size).astype(np.float32)
+    reps = (-(-height // matrix.shape[0]), -(-width // matrix.shape[1]))
+    return np.tile(thresholds, reps)[:height, :width]
+
+
+def _ordered_rows(engine: str) -> DitherEngine:
+    def dither_rows(pixels: np.ndarray, start: int, stop: int, levels: int) -> None:
+        thresholds = _threshold_map(engine, *pixels.shape)
+        step = np.float32(255.0 / (levels - 1))
+        band = pixels[start:stop]
+        band /= step
+        band += thresholds[start:stop]
+        np.floor(band, out=band)
+        np.clip(band, 0, levels - 1, out=band)
+        band *= step
+    return dither_rows
+
+
+def _threshold_rows(pixels: np.ndarray, start: int, stop: int, levels: int) -> None:
+    # The packers quantize to the nearest level themselves
+    pass
+
+
+_ENGINES: Dict[str, DitherEngine] = {
+    'threshold': _threshold_rows,
+    'bayer': _ordered_rows('bayer'),
+    'blue_noise': _ordered_rows('blue_noise'),
+    'atkinson': atkinson_rows,
+    'floyd_steinberg': floyd_steinberg_rows,
+}
+
+
+def dither_engine_name(dithering: Union[bool, str]) -> str:
+    """
+    Resolve the dithering argument of the update_screen methods.
+
+    :param dithering: An engine name, True for 'floyd_steinberg' or False for 'threshold'.
+    :return: The engine name.
+    :raises ValueError: If no engine has that name.
+    """
+    if dithering is True:
+        return 'floyd_steinberg'
+    if dithering is False:
+        return 'threshold'
+    if dithering not in _ENGINES:
+        raise ValueError(f"Unknown dithering engine: {dithering}, expected one of {list_dither_engines()}")
+    return dithering
+
+
+def list_dither_engines() -> List[str]:
+    return sorted(_ENGINES)
+
+
+def dither_rows(pixels: np.ndarray, start: int, stop: int, dithering: Union[bool, str] = True,
+                levels: int = 2) -> np.ndarray:
+    """
+    Dither rows start to stop of an image in place, see DitherEngine.
+
+    :param pixels: The input float32 pixel array.
+    :param start: First row to dither.
+    :param stop: Row after the last one to dither.
+    :param dithering: The engine, see dither_engine_name.
+    :param levels: Number of gray levels, 2 for 1-bit and 4 for 2-bit frames.
+    :return: The dithered pixel array.
+    """
+    _ENGINES[dither_engine_name(dithering)](pixels, start, stop, levels)
+    return pixels
+
+
+def dither(pixels: np.ndarray, dithering: Union[bool, str] = True, levels: int = 2) -> np.ndarray:
+    """
+    Dither an image in place.
+
+    :param pixels: The input float32 pixel array.
+    :param dithering: The engine: 'threshold', 'bayer', 'blue_noise', 'atkinson'
+                      or 'floyd_steinberg', True for 'floyd_steinberg' or False
+                      for 'threshold'.
+    :param levels: Number of gray levels, 2 for 1-bit and 4 for 2-bit frames.
+    :return: The dithered pixel array, quantized to the levels except for
+             'threshold'.
+    """
+    return dither_rows(pixels, 0, pixels.shape[0], dithering, levels)
+
+
+if __name__ == '__main__':
+    # Install step: compile the kernels into numba's on-disk cache
+    logging.basicConfig(level=logging.INFO)
+    warm_up(block=True)
+    raise SystemExit(0 if jit_ready() else 1)